@@ -0,0 +1,21 @@
+import sys
+
+from scraper.cleaning import clean_file
+
+"""
+    Clean scraped website info: '{}' and empty values become missing, missing
+    Payment Gateways get the most common gateway and every other missing value
+    becomes 'Unknown'. Works on CSV or Parquet files of any size.
+
+    Usage:
+    python 4_Cleaning_Scraped_Data.py [scraped file] [cleaned file]
+"""
+
+
+#Main Function Starts From Here
+if __name__ == '__main__':
+    src = sys.argv[1] if len(sys.argv) > 1 else '3_Scraped_Website_Info.csv'
+    dst = sys.argv[2] if len(sys.argv) > 2 else '5_Cleaned_Data.csv'
+
+    rows = clean_file(src, dst)
+    print(f"Cleaned {rows} rows from {src} into {dst}")
@@ -0,0 +1,281 @@
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+from benchmarks.bench_parsers import synthetic_page
+from benchmarks.server import add_fault_arguments, load_corpus
+from scraper import ExtractPool, Metrics, crawl
+from scraper.extract import FIELDS, extract_info
+from scraper.parsers import DEFAULT_BACKEND, keys_for, parse_page
+
+"""
+    Offline end-to-end benchmark. A recorded corpus (see benchmarks.record_corpus)
+    is replayed by benchmarks.server in a separate process, with optional
+    injected latency, errors and slow bodies, and the full crawl pipeline is
+    run against it. Every extractor is then timed alone on the same pages.
+
+    Usage:
+    python -m benchmarks.bench_crawl [corpus_dir] [--urls 2000] [--concurrency 50] [--processes N]
+                                     [--latency 0.05] [--error-rate 0.01] [--slow-rate 0.05] ...
+                                     [--output result.json] [--history benchmarks/history.jsonl]
+
+    Reported: pages/sec, p50/p99 latency, peak RSS and CPU time per page, as
+    JSON for tracking over time. The pipeline and every extractor run in a
+    fresh process each, so each peak RSS is that phase's own (the pipeline's
+    ExtractPool workers are reported separately). Without a corpus, synthetic
+    pages of a few sizes are used.
+"""
+
+
+def synthetic_corpus(directory):
+    sizes = {'small': (50, 5), 'medium': (500, 20), 'large': (3000, 60)}
+    for name, (links, scripts) in sizes.items():
+        with open(os.path.join(directory, f'{name}.html'), 'wb') as f:
+            f.write(synthetic_page(links, scripts))
+
+
+def percentile(values, p):
+    # Nearest rank on the sorted values
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, max(0, round(p / 100 * len(values)) - 1))]
+
+
+def cpu_seconds():
+    self_usage = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return self_usage.ru_utime + self_usage.ru_stime + children.ru_utime + children.ru_stime
+
+
+def peak_rss_mb(who=resource.RUSAGE_SELF):
+    # ru_maxrss is in KB on Linux and in bytes on macOS. For RUSAGE_CHILDREN it is
+    # the largest finished child, e.g. one ExtractPool worker
+    rss = resource.getrusage(who).ru_maxrss
+    return rss / 1024 ** 2 if sys.platform == 'darwin' else rss / 1024
+
+
+def _isolated(connection, function, args):
+    # Body of the process started by run_isolated
+    result = function(*args)
+    result['peak_rss_mb'] = peak_rss_mb()
+    workers = peak_rss_mb(resource.RUSAGE_CHILDREN)
+    if workers:
+        result['worker_peak_rss_mb'] = workers
+    connection.send(result)
+    connection.close()
+
+
+def run_isolated(function, *args):
+    """
+    Run one benchmark phase in a fresh process, so the peak RSS it reports is
+    that phase's alone and not the high-water mark of everything before it.
+
+    Returns:
+    dict: What function returned, plus peak_rss_mb and, if it started processes, worker_peak_rss_mb.
+    """
+    context = multiprocessing.get_context('spawn')
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=_isolated, args=(sender, function, args))
+    process.start()
+    sender.close()
+    try:
+        result = receiver.recv()
+    except EOFError:
+        raise RuntimeError(f'benchmark phase {function.__name__} exited with {process.exitcode}') from None
+    finally:
+        process.join()
+    return result
+
+
+def start_server(corpus, port, args):
+    command = [sys.executable, '-m', 'benchmarks.server', corpus, '--port', str(port),
+               '--latency', str(args.latency), '--jitter', str(args.jitter),
+               '--error-rate', str(args.error_rate), '--reset-rate', str(args.reset_rate),
+               '--slow-rate', str(args.slow_rate), '--slow-chunk', str(args.slow_chunk),
+               '--slow-delay', str(args.slow_delay), '--seed', str(args.seed)]
+    server = subprocess.Popen(command)
+    deadline = time.monotonic() + 10
+    while True:
+        try:
+            urllib.request.urlopen(f'http://127.0.0.1:{port}/robots.txt', timeout=1)
+            return server
+        except OSError:
+            if server.poll() is not None or time.monotonic() > deadline:
+                server.kill()
+                raise RuntimeError('benchmark server did not start')
+            time.sleep(0.1)
+
+
+def bench_pipeline(names, port, args):
+    """
+    Crawl args.urls URLs spread over the corpus pages and measure the whole pipeline.
+    """
+    urls = [f'http://127.0.0.1:{port}/{names[i % len(names)]}?i={i}' for i in range(args.urls)]
+    metrics = Metrics(detail=False)
+    done = []
+    cpu = cpu_seconds()
+    started = time.perf_counter()
+    if args.processes:
+        with ExtractPool(args.processes) as pool:
+            crawl(urls, concurrency=args.concurrency, per_host=args.concurrency, retries=args.retries,
+                  timeout=args.timeout, metrics=metrics, pool=pool, on_result=done.append, collect=False)
+    else:
+        crawl(urls, concurrency=args.concurrency, per_host=args.concurrency, retries=args.retries,
+              timeout=args.timeout, metrics=metrics, on_result=done.append, collect=False)
+    elapsed = time.perf_counter() - started
+    cpu = cpu_seconds() - cpu
+    total = metrics.stages['total'] if 'total' in metrics.stages else None
+    with urllib.request.urlopen(f'http://127.0.0.1:{port}/_stats') as response:
+        injected = json.load(response)
+    return {
+        'urls': len(urls),
+        'pages': len(done),
+        'failures': metrics.failures,
+        'seconds': elapsed,
+        'pages_per_sec': len(done) / elapsed if elapsed else None,
+        'latency_p50': total.percentile(50) if total else None,
+        'latency_p99': total.percentile(99) if total else None,
+        'cpu_per_page': cpu / len(done) if done else None,
+        'stages': {stage: {'p50': h.percentile(50), 'p99': h.percentile(99)} for stage, h in metrics.stages.items()},
+        'injected': injected,
+    }
+
+
+def extractor_contenders():
+    """
+    The timed extractors by name: extract_info with one field at a time, plus parsing alone and all fields.
+    """
+    keys = keys_for(FIELDS)
+    # Parsing every key all fields need, with no extractor run on the result
+    return {'parse only': lambda url, content: parse_page(content, keys),
+            **{field: lambda url, content, fields=[field]: extract_info(url, content, fields)
+               for field in FIELDS},
+            'all fields': lambda url, content: extract_info(url, content, FIELDS)}
+
+
+def bench_extractor(name, pages, repeat):
+    """
+    Time one extractor, see extractor_contenders, on every page.
+    """
+    run = extractor_contenders()[name]
+    latencies = []
+    cpu = time.process_time()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for page, content in pages.items():
+            start = time.perf_counter()
+            run(f'http://bench/{page}', content)
+            latencies.append(time.perf_counter() - start)
+    elapsed = time.perf_counter() - started
+    return {
+        'pages': len(latencies),
+        'pages_per_sec': len(latencies) / elapsed if elapsed else None,
+        'latency_p50': percentile(latencies, 50),
+        'latency_p99': percentile(latencies, 99),
+        'cpu_per_page': (time.process_time() - cpu) / len(latencies),
+    }
+
+
+def bench_extractors(pages, repeat):
+    """
+    Time every extractor alone, each in its own process for a peak RSS of its own.
+    """
+    return {name: run_isolated(bench_extractor, name, pages, repeat) for name in extractor_contenders()}
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def ms(seconds):
+    return f'{seconds * 1000:8.2f}ms' if seconds is not None else '     n/a  '
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the crawl pipeline against a local server.')
+    parser.add_argument('corpus', nargs='?', help='Directory of recorded pages. Default is synthetic pages')
+    parser.add_argument('--urls', type=int, default=1000, help='URLs to crawl, cycling over the corpus')
+    parser.add_argument('--concurrency', type=int, default=50)
+    parser.add_argument('--processes', type=int, default=0, help='Extract in a process pool of this size')
+    parser.add_argument('--retries', type=int, default=2)
+    parser.add_argument('--timeout', type=float, default=10)
+    parser.add_argument('--repeat', type=int, default=3, help='Passes over the corpus per extractor')
+    parser.add_argument('--port', type=int, default=8780)
+    parser.add_argument('--skip-pipeline', action='store_true', help='Only time the extractors')
+    parser.add_argument('--output', help='Write the result JSON to this file instead of stdout')
+    parser.add_argument('--history', help='Append the result as one JSON line to this file')
+    add_fault_arguments(parser)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as scratch:
+        corpus = args.corpus
+        if corpus is None:
+            corpus = scratch
+            synthetic_corpus(corpus)
+        pages = load_corpus(corpus)
+        if not pages:
+            parser.error(f'no .html pages in {corpus}')
+
+        result = {
+            'benchmark': 'crawl',
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'parser_backend': DEFAULT_BACKEND,
+            'corpus': {'path': args.corpus or 'synthetic', 'pages': len(pages),
+                       'bytes': sum(len(content) for content in pages.values())},
+            'config': {key: value for key, value in vars(args).items()
+                       if key not in ('corpus', 'output', 'history')},
+        }
+
+        if not args.skip_pipeline:
+            server = start_server(corpus, args.port, args)
+            try:
+                result['pipeline'] = run_isolated(bench_pipeline, sorted(pages), args.port, args)
+            finally:
+                server.terminate()
+                server.wait()
+        result['extractors'] = bench_extractors(pages, args.repeat)
+
+    pipeline = result.get('pipeline')
+    if pipeline:
+        print(f"Pipeline: {pipeline['pages']}/{pipeline['urls']} pages in {pipeline['seconds']:.2f}s, "
+              f"{pipeline['pages_per_sec']:.1f} pages/s, p50 {ms(pipeline['latency_p50'])}, "
+              f"p99 {ms(pipeline['latency_p99'])}, CPU {ms(pipeline['cpu_per_page'])}/page, "
+              f"peak RSS {pipeline['peak_rss_mb']:.0f} MB", file=sys.stderr)
+        if 'worker_peak_rss_mb' in pipeline:
+            print(f"  ExtractPool workers: peak RSS {pipeline['worker_peak_rss_mb']:.0f} MB each at most",
+                  file=sys.stderr)
+    for name, stats in result['extractors'].items():
+        print(f"  {name:<20} {stats['pages_per_sec']:9.1f} pages/s  p50 {ms(stats['latency_p50'])}  "
+              f"p99 {ms(stats['latency_p99'])}  CPU {ms(stats['cpu_per_page'])}/page  "
+              f"peak RSS {stats['peak_rss_mb']:4.0f} MB", file=sys.stderr)
+
+    text = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+    if args.history:
+        with open(args.history, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(result) + '\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+import argparse
+import os
+import time
+
+from scraper.extract import FIELDS
+from scraper.parsers import BACKENDS, available_backends, keys_for, parse_page
+
+"""
+    Compare the parser backends on sample pages.
+
+    Usage:
+    python -m benchmarks.bench_parsers [page.html | pages_dir ...] [--repeat N]
+
+    Without arguments a synthetic portal-style page is used. The legacy
+    full-tree BeautifulSoup parse is timed as a baseline when bs4 is installed.
+"""
+
+
+def synthetic_page(links=2000, scripts=40):
+    parts = ['<html lang="en"><head><title>Synthetic portal</title>',
+             '<meta name="description" content="Benchmark page">']
+    parts += [f'<script src="/static/js/chunk{i}.react.min.js"></script>' for i in range(scripts)]
+    parts += [f'<link rel="stylesheet" href="/static/css/style{i}.css">' for i in range(scripts // 2)]
+    parts.append('</head><body>')
+    parts += [f'<div class="item"><a href="/article/{i}">Article {i}</a><p>Some text {i}</p></div>'
+              for i in range(links)]
+    parts.append('<a href="https://facebook.com/page">fb</a></body></html>')
+    return ''.join(parts).encode()
+
+
+def load_pages(paths):
+    pages = {}
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if name.endswith(('.html', '.htm')):
+                    with open(os.path.join(path, name), 'rb') as f:
+                        pages[name] = f.read()
+        else:
+            with open(path, 'rb') as f:
+                pages[os.path.basename(path)] = f.read()
+    return pages
+
+
+def legacy_parse(content, keys):
+    # What extract_info did before the backends existed: full tree, one walk per field
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(content, 'html.parser')
+    soup.find('title'), soup.find('title'), soup.find('html'), soup.find('html')
+    soup.find('meta', attrs={'name': 'description'})
+    soup.find_all('a', href=True), soup.find_all('script', src=True), soup.find_all('link', href=True)
+
+
+def time_backend(parse, content, keys, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parse(content, keys)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark HTML parser backends.')
+    parser.add_argument('paths', nargs='*', help='HTML files or directories of saved pages')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per page, the best is reported')
+    args = parser.parse_args()
+
+    pages = load_pages(args.paths) if args.paths else {'synthetic': synthetic_page()}
+    keys = keys_for(FIELDS)
+
+    contenders = {name: (lambda c, k, name=name: parse_page(c, k, name)) for name in available_backends()}
+    try:
+        import bs4  # noqa: F401
+        contenders['bs4 (legacy)'] = legacy_parse
+    except ImportError:
+        pass
+
+    print(f"{'page':<30}{'size KB':>10}" + ''.join(f'{name:>16}' for name in contenders))
+    totals = dict.fromkeys(contenders, 0.0)
+    for page, content in pages.items():
+        row = f'{page[:29]:<30}{len(content) / 1024:>10.1f}'
+        for name, parse in contenders.items():
+            elapsed = time_backend(parse, content, keys, args.repeat)
+            totals[name] += elapsed
+            row += f'{elapsed * 1000:>13.2f} ms'
+        print(row)
+    print(f"{'total':<40}" + ''.join(f'{totals[name] * 1000:>13.2f} ms' for name in contenders))
+    missing = [name for name in BACKENDS if name not in contenders]
+    if missing:
+        print('Not installed:', ', '.join(missing))
+
+
+if __name__ == '__main__':
+    main()
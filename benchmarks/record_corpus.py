@@ -0,0 +1,81 @@
+import argparse
+import asyncio
+import json
+import os
+import re
+
+import aiohttp
+
+from scraper.extract import HEADERS
+from scraper.frontier import canonical_url
+
+"""
+    Record real-world homepages into a corpus directory for the offline benchmarks.
+
+    Usage:
+    python -m benchmarks.record_corpus urls.txt corpus_dir [--concurrency 20]
+
+    Each page is saved as <host>.html next to a manifest.json mapping file names
+    to the URL they were recorded from. Pages are downloaded once; the
+    benchmarks then replay them from benchmarks.server without touching the network.
+"""
+
+
+def page_name(url):
+    return re.sub(r'[^a-z0-9.-]+', '_', url.split('://', 1)[-1].lower()).strip('_') + '.html'
+
+
+async def record(urls, directory, concurrency=20, timeout=15):
+    """
+    Download urls into directory, skipping pages already recorded.
+
+    Returns:
+    dict: {file name: URL} of every page in the corpus.
+    """
+    os.makedirs(directory, exist_ok=True)
+    manifest_path = os.path.join(directory, 'manifest.json')
+    manifest = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path, encoding='utf-8') as f:
+            manifest = json.load(f)
+    slots = asyncio.Semaphore(concurrency)
+
+    async def fetch(session, url):
+        name = page_name(url)
+        if name in manifest:
+            return
+        async with slots:
+            try:
+                async with session.get(url, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+                    response.raise_for_status()
+                    body = await response.read()
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                print(f"Skipping {url}: {type(e).__name__} {e}")
+                return
+        with open(os.path.join(directory, name), 'wb') as f:
+            f.write(body)
+        manifest[name] = url
+        print(f"Recorded {url} ({len(body) / 1024:.0f} KB)")
+
+    async with aiohttp.ClientSession(headers=HEADERS) as session:
+        await asyncio.gather(*(fetch(session, url) for url in urls))
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Record homepages into a benchmark corpus.')
+    parser.add_argument('urls', help='Text file with one URL per line')
+    parser.add_argument('corpus', help='Directory to save the pages in')
+    parser.add_argument('--concurrency', type=int, default=20)
+    args = parser.parse_args()
+
+    with open(args.urls, encoding='utf-8') as f:
+        urls = [canonical_url(line) for line in f if line.strip() and not line.startswith('#')]
+    manifest = asyncio.run(record([url for url in urls if url], args.corpus, args.concurrency))
+    print(f"{len(manifest)} pages in {args.corpus}")
+
+
+if __name__ == '__main__':
+    main()
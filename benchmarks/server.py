@@ -0,0 +1,149 @@
+import argparse
+import asyncio
+import os
+import random
+
+from aiohttp import web
+
+"""
+    Local HTTP server replaying a recorded page corpus, for offline benchmarks.
+
+    Usage:
+    python -m benchmarks.server corpus_dir [--port 8780] [--latency 0.05] [--jitter 0.02]
+                                [--error-rate 0.01] [--slow-rate 0.05] [--slow-delay 0.01]
+
+    Every page of the corpus is served at /<name>, any query string ignored, so
+    one page can stand in for many URLs. Faults are injected per request with a
+    seeded RNG: a response delay, 503 errors, dropped connections and bodies
+    trickled out in small chunks.
+"""
+
+
+def load_corpus(directory):
+    """
+    Read every .html page of a corpus directory.
+
+    Returns:
+    dict: {file name: page bytes}.
+    """
+    pages = {}
+    for name in sorted(os.listdir(directory)):
+        if name.endswith(('.html', '.htm')):
+            with open(os.path.join(directory, name), 'rb') as f:
+                pages[name] = f.read()
+    return pages
+
+
+class FaultInjector:
+    """
+    Decides the latency and failure of each request.
+
+    Parameters:
+    latency (float): Seconds added before every response. Default is 0.
+    jitter (float): Up to this many seconds added on top, uniformly. Default is 0.
+    error_rate (float): Fraction of requests answered with 503. Default is 0.
+    reset_rate (float): Fraction of requests whose connection is dropped. Default is 0.
+    slow_rate (float): Fraction of bodies sent in slow chunks. Default is 0.
+    slow_chunk (int): Bytes per chunk of a slow body. Default is 4096.
+    slow_delay (float): Seconds between the chunks of a slow body. Default is 0.01.
+    seed (int): Seed of the RNG, so runs inject the same faults. Default is 0.
+    """
+
+    def __init__(self, latency=0.0, jitter=0.0, error_rate=0.0, reset_rate=0.0,
+                 slow_rate=0.0, slow_chunk=4096, slow_delay=0.01, seed=0):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.reset_rate = reset_rate
+        self.slow_rate = slow_rate
+        self.slow_chunk = slow_chunk
+        self.slow_delay = slow_delay
+        self.random = random.Random(seed)
+        self.counts = {'requests': 0, 'error': 0, 'reset': 0, 'slow': 0}
+
+    def delay(self):
+        return self.latency + self.random.uniform(0, self.jitter)
+
+    def fault(self):
+        """
+        'error', 'reset', 'slow' or None for a normal response.
+        """
+        self.counts['requests'] += 1
+        roll = self.random.random()
+        for fault, rate in (('error', self.error_rate), ('reset', self.reset_rate), ('slow', self.slow_rate)):
+            if roll < rate:
+                self.counts[fault] += 1
+                return fault
+            roll -= rate
+        return None
+
+
+def make_app(pages, faults):
+    """
+    aiohttp application serving pages with the faults of a FaultInjector.
+    """
+
+    async def robots(request):
+        return web.Response(text='User-agent: *\nAllow: /\n')
+
+    async def page(request):
+        body = pages.get(request.match_info['name'])
+        if body is None:
+            raise web.HTTPNotFound()
+        fault = faults.fault()
+        await asyncio.sleep(faults.delay())
+        if fault == 'error':
+            return web.Response(status=503)
+        if fault == 'reset':
+            request.transport.close()
+            return web.Response(status=500)
+        if fault != 'slow':
+            return web.Response(body=body, content_type='text/html', charset='utf-8')
+        response = web.StreamResponse(headers={'Content-Type': 'text/html; charset=utf-8'})
+        await response.prepare(request)
+        for start in range(0, len(body), faults.slow_chunk):
+            await response.write(body[start:start + faults.slow_chunk])
+            await asyncio.sleep(faults.slow_delay)
+        await response.write_eof()
+        return response
+
+    async def stats(request):
+        return web.json_response(faults.counts)
+
+    app = web.Application()
+    app.router.add_get('/robots.txt', robots)
+    app.router.add_get('/_stats', stats)
+    app.router.add_get('/{name}', page)
+    return app
+
+
+def add_fault_arguments(parser):
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds added to every response')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Random extra latency, up to this many seconds')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of 503 responses')
+    parser.add_argument('--reset-rate', type=float, default=0.0, help='Fraction of dropped connections')
+    parser.add_argument('--slow-rate', type=float, default=0.0, help='Fraction of bodies trickled out slowly')
+    parser.add_argument('--slow-chunk', type=int, default=4096, help='Bytes per chunk of a slow body')
+    parser.add_argument('--slow-delay', type=float, default=0.01, help='Seconds between slow chunks')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the fault RNG')
+
+
+def faults_from_args(args):
+    return FaultInjector(args.latency, args.jitter, args.error_rate, args.reset_rate,
+                         args.slow_rate, args.slow_chunk, args.slow_delay, args.seed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve a recorded page corpus with injected faults.')
+    parser.add_argument('corpus', help='Directory of recorded .html pages')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8780)
+    add_fault_arguments(parser)
+    args = parser.parse_args()
+
+    app = make_app(load_corpus(args.corpus), faults_from_args(args))
+    web.run_app(app, host=args.host, port=args.port, print=None, access_log=None)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,11 @@
+from .extract import extract_info
+from .engine import crawl, crawl_async, scrape_many
+from .cache import ResponseCache
+from .incremental import IncrementalState
+from .politeness import Politeness
+from .retry import DeadLetter, RetryPolicy
+from .transport import Transport
+from .pool import ExtractPool
+from .frontier import Frontier
+from .sinks import CSVSink, JSONLSink, ParquetSink, SinkGroup, open_sink
+from .metrics import Metrics
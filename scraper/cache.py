@@ -0,0 +1,201 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+"""
+    Persistent HTTP response cache. Bodies are stored content-addressed (by
+    SHA-256) under the cache directory and a small SQLite index maps each URL
+    to its body, validators (ETag / Last-Modified) and last extracted record.
+    Fresh entries are served without touching the network, stale ones are
+    revalidated with a conditional GET, and a 304 reuses both the stored body
+    and the stored record so the extract step is skipped as well.
+
+    The index runs in WAL mode with commits batched like the Frontier's, and
+    every method may be called from the crawl's executor threads, so the
+    engine keeps body reads and writes off the event loop.
+"""
+
+
+class CacheEntry:
+    """
+    What the cache knows about one URL.
+    """
+
+    def __init__(self, url, digest, etag, last_modified, stored_at, size, record, fresh):
+        self.url = url
+        self.digest = digest
+        self.etag = etag
+        self.last_modified = last_modified
+        self.stored_at = stored_at
+        self.size = size
+        self.record = record
+        self.fresh = fresh
+
+
+class ResponseCache:
+    """
+    On-disk, size-bounded LRU cache of page bodies keyed by URL.
+
+    Parameters:
+    directory (str): Where bodies and the index are kept. Created if missing.
+    max_bytes (int): Total body size kept before least recently used entries are evicted. Default is 1 GB.
+    ttl (int): Seconds an entry is served without revalidation. Default is 1 day.
+    batch_size (int): Index updates per commit. Default is 1000.
+    """
+
+    def __init__(self, directory, max_bytes=1024 ** 3, ttl=24 * 3600, batch_size=1000):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.batch_size = batch_size
+        os.makedirs(os.path.join(directory, 'objects'), exist_ok=True)
+        # Shared by the executor threads, the lock serialises every use of the connection
+        self.db = sqlite3.connect(os.path.join(directory, 'index.sqlite3'), check_same_thread=False)
+        self.lock = threading.Lock()
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('PRAGMA synchronous=NORMAL')
+        self.db.execute('''
+            CREATE TABLE IF NOT EXISTS entries (
+                url TEXT PRIMARY KEY,
+                digest TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                stored_at REAL NOT NULL,
+                last_used REAL NOT NULL,
+                size INTEGER NOT NULL,
+                record TEXT
+            )''')
+        self.db.execute('CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used)')
+        self.db.commit()
+        # Running total of the entry sizes, so a store does not have to sum the table
+        self.total = self.db.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+        self.uncommitted = 0
+        self.stats = {'hits': 0, 'revalidated': 0, 'misses': 0, 'stores': 0, 'evictions': 0, 'bytes_saved': 0}
+
+    def _path(self, digest):
+        return os.path.join(self.directory, 'objects', digest[:2], digest)
+
+    def lookup(self, url):
+        """
+        Return the CacheEntry for url, or None if it is not cached.
+        """
+        with self.lock:
+            row = self.db.execute(
+                'SELECT digest, etag, last_modified, stored_at, size, record FROM entries WHERE url = ?',
+                (url,)).fetchone()
+        if row is None or not os.path.exists(self._path(row[0])):
+            self.stats['misses'] += 1
+            return None
+        digest, etag, last_modified, stored_at, size, record = row
+        fresh = time.time() - stored_at < self.ttl
+        return CacheEntry(url, digest, etag, last_modified, stored_at, size,
+                          json.loads(record) if record else None, fresh)
+
+    def conditional_headers(self, entry):
+        """
+        Request headers that let the server answer 304 if the page is unchanged.
+        """
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers['If-None-Match'] = entry.etag
+            if entry.last_modified:
+                headers['If-Modified-Since'] = entry.last_modified
+        return headers
+
+    def read(self, entry):
+        with open(self._path(entry.digest), 'rb') as f:
+            return f.read()
+
+    def hit(self, entry, revalidated=False):
+        """
+        Record that entry was served from the cache, refreshing it when a 304 revalidated it.
+        """
+        now = time.time()
+        with self.lock:
+            if revalidated:
+                self.stats['revalidated'] += 1
+                self.db.execute('UPDATE entries SET stored_at = ?, last_used = ? WHERE url = ?',
+                                (now, now, entry.url))
+            else:
+                self.stats['hits'] += 1
+                self.db.execute('UPDATE entries SET last_used = ? WHERE url = ?', (now, entry.url))
+            self.stats['bytes_saved'] += entry.size
+            self._dirty()
+
+    def store(self, url, body, headers, record=None, digest=None):
+        """
+        Store a complete response body with its validators and extracted record.
+        """
+        digest = digest or hashlib.sha256(body).hexdigest()
+        path = self._path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+            with open(tmp, 'wb') as f:
+                f.write(body)
+            os.replace(tmp, path)
+        now = time.time()
+        with self.lock:
+            old = self.db.execute('SELECT digest, size FROM entries WHERE url = ?', (url,)).fetchone()
+            self.db.execute(
+                'INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (url, digest, headers.get('ETag'), headers.get('Last-Modified'), now, now, len(body),
+                 json.dumps(record) if record is not None else None))
+            self.total += len(body)
+            if old is not None:
+                self.total -= old[1]
+                if old[0] != digest:
+                    self._release(old[0])
+            self.stats['stores'] += 1
+            self._dirty()
+            if self.total > self.max_bytes:
+                self._evict()
+
+    def _release(self, digest):
+        # Bodies are shared between URLs with identical content, delete only the last reference
+        if self.db.execute('SELECT 1 FROM entries WHERE digest = ? LIMIT 1', (digest,)).fetchone() is None:
+            try:
+                os.remove(self._path(digest))
+            except FileNotFoundError:
+                pass
+
+    def _dirty(self):
+        # Index updates are committed in batches, a crash loses at most one batch of them
+        self.uncommitted += 1
+        if self.uncommitted >= self.batch_size:
+            self.db.commit()
+            self.uncommitted = 0
+
+    def _evict(self):
+        # Least recently used first, read lazily since usually only a few go
+        cursor = self.db.execute('SELECT url, digest, size FROM entries ORDER BY last_used')
+        while self.total > self.max_bytes:
+            rows = cursor.fetchmany(100)
+            if not rows:
+                break
+            for url, digest, size in rows:
+                self.db.execute('DELETE FROM entries WHERE url = ?', (url,))
+                self._release(digest)
+                self.stats['evictions'] += 1
+                self.total -= size
+                if self.total <= self.max_bytes:
+                    break
+        self.db.commit()
+        self.uncommitted = 0
+
+    def report(self):
+        """
+        One line summary of the cache counters for the end of a run.
+        """
+        s = self.stats
+        return (f"Cache: {s['hits']} hits, {s['revalidated']} revalidated (304), {s['misses']} misses, "
+                f"{s['stores']} stored, {s['evictions']} evicted, {s['bytes_saved'] / 1024:.1f} KB saved")
+
+    def close(self):
+        with self.lock:
+            self.db.commit()
+            self.db.close()
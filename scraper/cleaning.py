@@ -0,0 +1,221 @@
+import glob
+import os
+
+import numpy as np
+import pandas as pd
+
+from .output import schema_for
+
+"""
+    Batch cleaning stage, the importable replacement for the manual passes in
+    4_Cleaning_Scraped_Data.ipynb. The same rules are applied to every chunk in
+    a single vectorised pass per column:
+
+        '{}', empty and 'N/A' values   -> missing
+        missing Payment Gateways       -> the most common gateway value (mode),
+                                          'Unknown' if the column has none
+        any other missing value        -> 'Unknown'
+
+    CSV and Parquet inputs are streamed chunk by chunk, so memory stays bounded
+    by the chunk size whatever the size of the file.
+"""
+
+
+# Values the scraper writes when a field has nothing in it
+MISSING_VALUES = ['{}', '', 'N/A']
+
+# Fill value for missing entries of every column without a dedicated rule
+UNKNOWN = 'Unknown'
+
+
+def _is_parquet(path):
+    return path.lower().endswith(('.parquet', '.pq'))
+
+
+def _parquet_dataset(path):
+    # A single Parquet file or a directory of parts (ParquetSink), read as one table
+    import pyarrow.dataset as ds
+
+    if os.path.isdir(path):
+        # Only finished parts, a crashed ParquetSink may leave *.tmp files behind
+        parts = sorted(glob.glob(os.path.join(path, '*.parquet')))
+        if not parts:
+            # No batch was written yet: an empty table of every field
+            return ds.dataset([], format='parquet', schema=schema_for())
+        path = parts
+    return ds.dataset(path, format='parquet')
+
+
+def read_chunks(path, chunksize=50000, columns=None):
+    """
+    Yield DataFrame chunks of a CSV file or of a Parquet file or directory.
+    """
+    if _is_parquet(path):
+        for batch in _parquet_dataset(path).to_batches(batch_size=chunksize, columns=columns):
+            if batch.num_rows:
+                yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunksize, usecols=columns)
+
+
+def columns_of(path):
+    """
+    Column names of a CSV file or of a Parquet file or directory, read from the header or schema only.
+    """
+    if _is_parquet(path):
+        return _parquet_dataset(path).schema.names
+    return list(pd.read_csv(path, nrows=0).columns)
+
+
+def nested_columns(path):
+    """
+    Names of the list and map columns of a Parquet file or directory, none for CSV.
+    """
+    if not _is_parquet(path):
+        return set()
+    import pyarrow as pa
+
+    return {field.name for field in _parquet_dataset(path).schema
+            if pa.types.is_list(field.type) or pa.types.is_map(field.type)}
+
+
+def _missing_mask(series, nested=False):
+    """
+    Boolean mask of the missing entries of one column.
+    """
+    if nested:
+        # List and map cells from Parquet: null or an empty container counts as missing
+        return np.fromiter((v is None or len(v) == 0 for v in series), dtype=bool, count=len(series))
+    return (series.isna() | series.isin(MISSING_VALUES)).to_numpy()
+
+
+def _key(value):
+    # Map cells arrive as lists of (key, value) tuples and lists as arrays, count them as tuples
+    return tuple(value) if isinstance(value, (list, np.ndarray)) else value
+
+
+def payment_mode(path, chunksize=50000):
+    """
+    Most common non-missing Payment Gateways value of a file, read column-only.
+
+    Returns:
+    The mode, or None if the column is missing or has no values at all.
+    """
+    if 'Payment Gateways' not in columns_of(path):
+        # e.g. a crawl run with --fields title,language
+        return None
+    nested = 'Payment Gateways' in nested_columns(path)
+    counts = {}
+    for chunk in read_chunks(path, chunksize, columns=['Payment Gateways']):
+        series = chunk['Payment Gateways']
+        present = series[~_missing_mask(series, nested)]
+        for value, count in present.map(_key).value_counts(sort=False).items():
+            counts[value] = counts.get(value, 0) + count
+    if not counts:
+        return None
+    mode = max(counts, key=lambda value: (counts[value], str(value)))
+    return list(mode) if isinstance(mode, tuple) else mode
+
+
+def clean_chunk(df, payment_gateway_mode, nested=()):
+    """
+    Apply the cleaning rules to one chunk, one vectorised pass per column.
+
+    Parameters:
+    df (DataFrame): A chunk of scraped results.
+    payment_gateway_mode: Fill value for missing Payment Gateways, see payment_mode. None fills 'Unknown'.
+    nested (iterable): Names of list/map columns, see nested_columns.
+
+    Returns:
+    DataFrame: The cleaned chunk.
+    """
+    columns = {}
+    for name in df.columns:
+        series = df[name]
+        is_nested = name in nested
+        mask = _missing_mask(series, is_nested)
+        fill = UNKNOWN
+        if name == 'Payment Gateways' and payment_gateway_mode is not None:
+            fill = payment_gateway_mode
+        if is_nested and isinstance(fill, str):
+            # Typed list/map columns cannot hold 'Unknown', their empty cells become null
+            fill = None
+        if not mask.any():
+            columns[name] = series
+            continue
+        values = series.to_numpy(dtype=object).copy()
+        if fill is None or isinstance(fill, str):
+            values[mask] = fill
+        else:
+            # A list fill value must be placed cell by cell or numpy would broadcast it
+            for i in np.flatnonzero(mask):
+                values[i] = fill
+        columns[name] = pd.Series(values, index=df.index, name=name)
+    return pd.DataFrame(columns, index=df.index)
+
+
+def _as_text(value):
+    # One text form per kind of cell, the same the CSV sink writes for fresh results
+    if value is None:
+        return UNKNOWN
+    if isinstance(value, (list, np.ndarray)):
+        if len(value) and isinstance(value[0], tuple):
+            return str(dict(value))
+        return ', '.join(str(item) for item in value)
+    return value
+
+
+def flatten_nested(df, nested):
+    """
+    Turn the list and map cells of a cleaned chunk into text for a CSV file:
+    lists become 'a, b' and maps "{'key': 'value'}", as the CSV sink writes them.
+    """
+    if not nested:
+        return df
+    df = df.copy()
+    for name in nested:
+        if name in df.columns:
+            df[name] = [_as_text(value) for value in df[name]]
+    return df
+
+
+def clean_file(src, dst, chunksize=50000):
+    """
+    Clean a scraped CSV or Parquet file into dst, streaming chunk by chunk.
+
+    Parameters:
+    src (str): Scraped results, .csv or .parquet (a file or a ParquetSink directory).
+    dst (str): Cleaned output, .csv or .parquet.
+    chunksize (int): Rows held in memory at a time. Default is 50000.
+
+    Returns:
+    int: Number of rows written.
+    """
+    mode = payment_mode(src, chunksize)
+    nested = nested_columns(src)
+    rows = 0
+    writer = None
+    schema = None
+    if _is_parquet(src):
+        schema = _parquet_dataset(src).schema
+    try:
+        for chunk in read_chunks(src, chunksize):
+            chunk = clean_chunk(chunk, mode, nested)
+            if _is_parquet(dst):
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+
+                table = pa.Table.from_pandas(chunk, schema=schema, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(dst, table.schema)
+                writer.write_table(table)
+            else:
+                chunk = flatten_nested(chunk, nested)
+                chunk.to_csv(dst, mode='w' if rows == 0 else 'a', header=rows == 0, index=False)
+            rows += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    if rows == 0 and not os.path.exists(dst):
+        open(dst, 'w').close()
+    return rows
@@ -0,0 +1,172 @@
+import argparse
+import json
+import sqlite3
+import sys
+
+from .cache import ResponseCache
+from .engine import scrape_many
+from .extract import FIELDS
+from .frontier import BloomFilter, Frontier, canonical_url, url_key
+from .metrics import Metrics
+from .politeness import Politeness
+from .pool import ExtractPool
+from .sinks import SINKS, open_sink
+
+"""
+    Command line interface: python -m scraper [urls.txt | -] [-o results.csv] [--fields title,language]
+
+    URLs are read one per line from a file or stdin, deduplicated, scraped
+    concurrently and written to the chosen sink as they complete (CSV, JSON
+    lines or Parquet by file extension, JSON lines on stdout by default).
+"""
+
+
+# Short names accepted by --fields
+FIELD_ALIASES = {
+    'social': 'Social Media Links',
+    'tech': 'Tech Stack',
+    'title': 'Meta Title',
+    'description': 'Meta Description',
+    'gateways': 'Payment Gateways',
+    'language': 'Language',
+    'category': 'Category',
+}
+
+
+def parse_fields(text):
+    """
+    Turn a comma separated --fields value (short or full names) into field names.
+    """
+    if not text:
+        return None
+    fields = []
+    for name in text.split(','):
+        name = name.strip()
+        field = FIELD_ALIASES.get(name.lower(), name)
+        if field not in FIELDS:
+            raise argparse.ArgumentTypeError(
+                f"unknown field {name!r}, choose from {', '.join(FIELD_ALIASES)} or the full names")
+        fields.append(field)
+    return fields
+
+
+def read_urls(path):
+    """
+    Yield the URLs of a file ('-' for stdin), one per line, skipping blanks and '#' comments.
+    """
+    f = sys.stdin if path == '-' else open(path, encoding='utf-8')
+    try:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                yield line
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+def unique_urls(urls, capacity=1000000):
+    """
+    Canonicalise and deduplicate a stream of URLs without holding them all in memory.
+    URLs the Bloom filter has probably seen are checked against a temporary
+    on-disk table of the keys so far, so a false positive never drops a URL.
+    """
+    seen = BloomFilter(capacity)
+    # '' opens a private temporary database that SQLite spills to disk as it grows
+    keys = sqlite3.connect('')
+    keys.execute('CREATE TABLE seen (key TEXT PRIMARY KEY)')
+    try:
+        for url in urls:
+            url = canonical_url(url)
+            if url is None:
+                continue
+            key = url_key(url)
+            if not seen.add(key) and keys.execute('SELECT 1 FROM seen WHERE key = ?', (key,)).fetchone():
+                continue
+            keys.execute('INSERT INTO seen VALUES (?)', (key,))
+            yield url
+    finally:
+        keys.close()
+
+
+class _StdoutSink:
+    # JSON lines on stdout, same interface as the file sinks
+    written = 0
+
+    def write(self, record):
+        print(json.dumps(record), flush=True)
+        self.written += 1
+
+    def close(self):
+        pass
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m scraper', description='Scrape website information for many URLs.')
+    parser.add_argument('input', nargs='?', default='-', help="File with one URL per line, '-' for stdin (default)")
+    parser.add_argument('-o', '--output', default='-',
+                        help=f"Result file ({', '.join(SINKS)}), '-' for JSON lines on stdout (default)")
+    parser.add_argument('-f', '--fields', type=parse_fields,
+                        help=f"Comma separated fields to extract: {', '.join(FIELD_ALIASES)}. Default is all")
+    parser.add_argument('-c', '--concurrency', type=int, default=50, help='Requests in flight overall')
+    parser.add_argument('--per-host', type=int, default=2, help='Requests in flight per host')
+    parser.add_argument('--timeout', type=float, default=10, help='Seconds to wait for each response')
+    parser.add_argument('--retries', type=int, default=2, help='Attempts per URL')
+    parser.add_argument('--ordered', action='store_true', help='Write results in input order')
+    parser.add_argument('--processes', type=int, default=0, help='Extract in a process pool of this size')
+    parser.add_argument('--rate', type=float, help='Requests per second per host, honouring robots.txt')
+    parser.add_argument('--cache', help='Directory of an on-disk response cache')
+    parser.add_argument('--frontier', help='SQLite queue file, makes the crawl resumable')
+    parser.add_argument('--metrics', help='Write stage timings to this .prom or .json file')
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    options = {'per_host': args.per_host, 'timeout': args.timeout, 'retries': args.retries,
+               'ordered': args.ordered}
+
+    resume = False
+    if args.frontier:
+        urls = frontier = Frontier(args.frontier)
+        # An existing queue file continues its crawl, appending to the same output
+        resume = len(frontier) > 0
+        added = frontier.load(args.input)
+        print(f"Frontier: {added} new URLs, {frontier.counts()}", file=sys.stderr)
+    else:
+        frontier = None
+        urls = unique_urls(read_urls(args.input))
+
+    sink = _StdoutSink() if args.output == '-' else open_sink(args.output, args.fields, resume=resume)
+    if resume and frontier is not None and args.output != '-':
+        # URLs finished after the output's last checkpoint were lost with it and are fetched again
+        reset = frontier.reconcile(sink.completed_urls())
+        print(f"Resuming: {reset} URLs without a saved result are queued again", file=sys.stderr)
+    if args.rate:
+        options['politeness'] = Politeness(rate=args.rate)
+    cache = options['cache'] = ResponseCache(args.cache) if args.cache else None
+    metrics = options['metrics'] = Metrics() if args.metrics else None
+    pool = options['pool'] = ExtractPool(args.processes) if args.processes else None
+
+    try:
+        for record in scrape_many(urls, fields=args.fields, concurrency=args.concurrency, **options):
+            sink.write(record)
+    except KeyboardInterrupt:
+        # Everything written so far is kept, --frontier resumes from here
+        print('Interrupted', file=sys.stderr)
+    finally:
+        sink.close()
+        if pool is not None:
+            pool.close()
+        if cache is not None:
+            cache.close()
+        if frontier is not None:
+            frontier.close()
+
+    print(f"Wrote {sink.written} results", file=sys.stderr)
+    if metrics is not None:
+        print(metrics.report(), file=sys.stderr)
+        if args.metrics.endswith('.prom'):
+            metrics.to_prometheus(args.metrics)
+        else:
+            metrics.to_json(args.metrics)
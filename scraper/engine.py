@@ -0,0 +1,487 @@
+import asyncio
+import functools
+import hashlib
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import aiohttp
+
+from .extract import FIELDS, extract_info
+from .frontier import Frontier
+from .metrics import Sample, timed_extract
+from .retry import PermanentError, RetryPolicy, classify
+from .stream import HeadWatcher, can_stop_early
+from .transport import Transport
+
+"""
+    Concurrent crawl engine. Pages are downloaded with asyncio over one shared
+    connection pool (see scraper.transport) and handed to a worker pool for parsing, so a run
+    takes about as long as the slowest fetches instead of the sum of them all.
+"""
+
+
+class Fetched:
+    """
+    Outcome of one successful HTTP exchange.
+    """
+
+    def __init__(self, status, headers, body, complete, url=None, charset=None):
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.complete = complete
+        self.url = url
+        self.charset = charset
+
+
+async def _read(response, fields, max_bytes, chunk_size=16384):
+    """
+    Stream a response body, stopping at max_bytes or as soon as every
+    requested field is resolved.
+
+    Returns:
+    tuple: (downloaded part of the body, whether the whole body was read).
+    """
+    watcher = HeadWatcher(fields, response.charset or 'utf-8') if can_stop_early(fields) else None
+    chunks = []
+    size = 0
+    async for chunk in response.content.iter_chunked(chunk_size):
+        if max_bytes is not None and size + len(chunk) > max_bytes:
+            chunks.append(chunk[:max_bytes - size])
+            return b''.join(chunks), False
+        chunks.append(chunk)
+        size += len(chunk)
+        if watcher is not None and watcher.feed_bytes(chunk):
+            return b''.join(chunks), response.content.at_eof()
+    return b''.join(chunks), True
+
+
+class WorkQueue:
+    """
+    FIFO of (index, url, attempt) items shared by the workers, used without politeness.
+    """
+
+    def __init__(self, workers):
+        self.workers = workers
+        self.queue = asyncio.Queue()
+
+    def put(self, item, url=None):
+        self.queue.put_nowait(item)
+
+    def close(self):
+        # One stop marker per worker
+        for _ in range(self.workers):
+            self.queue.put_nowait(None)
+
+    async def get(self):
+        return await self.queue.get()
+
+    def cancel(self):
+        # Nothing runs in the background, see HostScheduler.cancel
+        pass
+
+
+class Crawler:
+    """
+    Holds the settings and shared state of one crawl, see crawl_async for the parameters.
+    """
+
+    def __init__(self, concurrency=50, per_host=2, retries=2, timeout=2, fields=None,
+                 max_bytes=None, extract=extract_info, executor=None, cache=None, incremental=None,
+                 on_result=None, politeness=None, retry=None, dead_letter=None, transport=None,
+                 pool=None, ordered=False, max_queued=None, collect=True, metrics=None):
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.retry = retry or RetryPolicy(attempts=retries)
+        self.dead_letter = dead_letter
+        self.timeout = timeout
+        self.fields = FIELDS if fields is None else list(fields)
+        unknown = [field for field in self.fields if field not in FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown fields {unknown}, expected names from {FIELDS}")
+        self.max_bytes = max_bytes
+        self.extract = extract
+        self.executor = executor
+        self.cache = cache
+        self.incremental = incremental
+        self.on_result = on_result
+        self.politeness = politeness
+        self.transport = transport or Transport(concurrency, per_host)
+        self.pool = pool
+        self.ordered = ordered
+        self.max_queued = max_queued
+        self.collect = collect
+        self.metrics = metrics
+        self.frontier = None
+        self.session = None
+
+    async def fetch(self, url, headers=None, sample=None):
+        """
+        Make one attempt at downloading a page. Failures raise, the worker decides about retries.
+
+        Returns:
+        Fetched: The response.
+        """
+        async with self.session.get(url, headers=headers, trace_request_ctx=sample,
+                                    timeout=aiohttp.ClientTimeout(total=self.timeout)) as response:
+            if response.status == 304:
+                return Fetched(304, response.headers, b'', True, str(response.url))
+            response.raise_for_status()
+            started = time.perf_counter()
+            if self.max_bytes is None and not can_stop_early(self.fields):
+                body, complete = await response.read(), True
+            else:
+                # Leaving the block early closes the connection instead of draining the body
+                body, complete = await _read(response, self.fields, self.max_bytes)
+            transfer = time.perf_counter() - started
+            self.transport.stats.add_transfer(transfer, len(body))
+            if sample is not None:
+                sample.add('transfer', transfer)
+                sample.bytes = len(body)
+            return Fetched(response.status, response.headers, body, complete, str(response.url), response.charset)
+
+    async def parse(self, url, content, sample=None, encoding=None):
+        # Parsing is CPU work, keep it off the event loop
+        metrics = self.metrics
+        if self.pool is not None:
+            return await self.pool.run(url, content, self.fields, sample, metrics is not None and metrics.detail,
+                                       encoding)
+        loop = asyncio.get_running_loop()
+        if sample is None:
+            return await loop.run_in_executor(
+                self.executor, functools.partial(self.extract, url, content, self.fields, encoding=encoding))
+        args = (timed_extract, self.extract, url, content, self.fields, metrics.detail, encoding)
+        if metrics.profile:
+            args = (metrics.profiled,) + args
+        result, timings = await loop.run_in_executor(self.executor, *args)
+        for stage, seconds in timings.items():
+            sample.add(stage, seconds)
+        return result
+
+    def _select(self, url, record):
+        """
+        Cut a stored record down to the requested fields, None if it lacks any of them.
+        """
+        if record is None or not all(field in record for field in self.fields):
+            return None
+        return {'URL': url, **{field: record[field] for field in FIELDS if field in self.fields}}
+
+    async def _extract(self, url, digest, body=None, entry=None, sample=None, encoding=None):
+        """
+        Turn a page into its record, reusing earlier work when the content is already known.
+        """
+        result = None
+        if self.incremental is not None:
+            result = self._select(url, self.incremental.reuse(url, digest))
+        if result is None and entry is not None:
+            result = self._select(url, entry.record)
+        if result is None:
+            if body is None:
+                started = time.perf_counter()
+                body = await asyncio.get_running_loop().run_in_executor(self.executor, self.cache.read, entry)
+                if sample is not None:
+                    sample.add('cache_read', time.perf_counter() - started)
+            result = await self.parse(url, body, sample, encoding)
+        if self.incremental is not None:
+            self.incremental.update(url, digest, result)
+        return result
+
+    async def scrape(self, url, sample=None):
+        """
+        Scrape one URL, going through the response cache when there is one.
+        Stage times are added to sample if given.
+
+        Returns:
+        dict: The scraped information. Failures raise, see scraper.retry.classify.
+        """
+        cache = self.cache
+        # The cache touches the disk, it is used from the executor to keep the event loop free
+        loop = asyncio.get_running_loop()
+        entry = await loop.run_in_executor(self.executor, cache.lookup, url) if cache is not None else None
+        if entry is not None and entry.fresh:
+            cache.hit(entry)
+            if sample is not None:
+                sample.source = 'cache'
+            return await self._extract(url, entry.digest, entry=entry, sample=sample)
+
+        if self.politeness is not None:
+            started = time.perf_counter()
+            allowed = await self.politeness.allowed(self.session, url)
+            if sample is not None:
+                sample.add('robots', time.perf_counter() - started)
+            if not allowed:
+                raise PermanentError('disallowed by robots.txt')
+        fetched = await self.fetch(url, cache.conditional_headers(entry) if cache is not None else None, sample)
+        if self.frontier is not None and fetched.url is not None and fetched.url != url:
+            self.frontier.redirected(url, fetched.url)
+        if fetched.status == 304 and entry is not None:
+            cache.hit(entry, revalidated=True)
+            if sample is not None:
+                sample.source = 'revalidated'
+            return await self._extract(url, entry.digest, entry=entry, sample=sample)
+
+        # Truncated bodies get no hash and are never cached, a later run might need the rest of the page
+        digest = hashlib.sha256(fetched.body).hexdigest() if fetched.complete else None
+        result = await self._extract(url, digest, body=fetched.body, sample=sample, encoding=fetched.charset)
+        if cache is not None and digest is not None:
+            record = result if all(field in result for field in FIELDS) else None
+            await loop.run_in_executor(self.executor, cache.store, url, fetched.body, fetched.headers, record, digest)
+        return result
+
+    def _failed(self, url, attempt, error):
+        """
+        Handle a failed attempt, deciding whether it is worth a deferred retry.
+
+        Returns:
+        float: Seconds until the retry, or None if the URL failed for good.
+        """
+        transient, reason = classify(error)
+        attempts = self.retry.attempts
+        if transient and attempt + 1 < attempts:
+            delay = self.retry.backoff(attempt, error)
+            print(f"Attempt {attempt+1}/{attempts} failed for {url}: {reason}, retrying in {delay:.1f}s",
+                  file=sys.stderr)
+            return delay
+        print(f"Failed to scrape {url} after {attempt+1} attempts: {reason}", file=sys.stderr)
+        if self.dead_letter is not None:
+            self.dead_letter.write(url, reason, attempt + 1)
+        if self.incremental is not None:
+            self.incremental.failed(url)
+        if self.frontier is not None:
+            self.frontier.failed(url)
+        if self.metrics is not None:
+            self.metrics.failed(url)
+        return None
+
+    def _emit(self, index, result):
+        """
+        Pass a finished result to on_result, holding it back until all earlier URLs are done if ordered.
+
+        Returns:
+        int: How many URLs were delivered, the queue slots they may give back.
+        """
+        if self.on_result is None:
+            return 1
+        if not self.ordered:
+            if result is not None:
+                self.on_result(result)
+            return 1
+        self.finished[index] = result
+        delivered = 0
+        while self.next_index in self.finished:
+            result = self.finished.pop(self.next_index)
+            self.next_index += 1
+            delivered += 1
+            if result is not None:
+                self.on_result(result)
+        return delivered
+
+    async def _worker(self, source, results):
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await source.get()
+            if item is None:
+                return
+            index, url, attempt = item
+            sample = Sample(url) if self.metrics is not None else None
+            try:
+                result = await self.scrape(url, sample)
+            except Exception as e:
+                try:
+                    delay = self._failed(url, attempt, e)
+                except Exception as failure:
+                    # Bookkeeping of one bad URL must not take the worker, and the crawl, down with it
+                    print(f"Could not record the failure of {url}: {failure!r}", file=sys.stderr)
+                    delay = None
+                if delay is not None:
+                    # Re-enqueue later instead of sleeping, the worker moves on to other URLs
+                    self.retrying[index] = loop.call_later(delay, self._requeue, source, (index, url, attempt + 1))
+                    continue
+                result = None
+            if result is not None and self.frontier is not None:
+                self.frontier.done(url)
+            if result is not None and sample is not None:
+                self.metrics.observe(sample)
+            if self.collect and result is not None:
+                results[index] = result
+            delivered = self._emit(index, result)
+            self.outstanding -= 1
+            if self.slots is not None:
+                # A result held back for ordering keeps its slot, so the buffer stays within max_queued
+                for _ in range(delivered):
+                    self.slots.release()
+            if self.outstanding == 0 and self.fed:
+                source.close()
+
+    def _requeue(self, source, item):
+        # Timer callback of a deferred retry
+        del self.retrying[item[0]]
+        source.put(item, item[1])
+
+    async def _feed(self, urls, source):
+        """
+        Put the URLs on source, at most max_queued of them unfinished at a time.
+        """
+        index = 0
+        urls = iter(urls)
+        while True:
+            # Wait for room before taking the next URL, it may be skipped meanwhile (see Frontier.redirected)
+            if self.slots is not None:
+                await self.slots.acquire()
+            url = next(urls, None)
+            if url is None:
+                break
+            self.outstanding += 1
+            source.put((index, url, 0), url)
+            index += 1
+        self.fed = True
+        if self.outstanding == 0:
+            source.close()
+        return index
+
+    async def run(self, urls):
+        if isinstance(urls, Frontier):
+            self.frontier = urls
+        results = {}
+        own_executor = self.executor is None
+        if own_executor:
+            self.executor = ThreadPoolExecutor()
+
+        try:
+            # One pooled session shared by every worker, it enforces both connection limits
+            async with self.transport.session() as session:
+                self.session = session
+                if self.politeness is not None:
+                    # Hosts are interleaved and paced, workers take whichever host is due next
+                    source = self.politeness.scheduler(session)
+                else:
+                    source = WorkQueue(self.concurrency)
+                self.outstanding = 0
+                self.fed = False
+                self.finished = {}
+                self.next_index = 0
+                self.retrying = {}
+                # A frontier may hold millions of URLs, only a window of them is queued in memory
+                max_queued = self.max_queued
+                if max_queued is None and self.frontier is not None:
+                    max_queued = self.frontier.batch_size
+                self.slots = asyncio.Semaphore(max_queued) if max_queued else None
+                workers = [asyncio.create_task(self._worker(source, results)) for _ in range(self.concurrency)]
+                try:
+                    count = await self._feed(urls, source)
+                    await asyncio.gather(*workers)
+                finally:
+                    # A crawl that is cancelled or fails stops its workers while the session is still open,
+                    # the URLs they held are left unfinished rather than failed
+                    for timer in self.retrying.values():
+                        timer.cancel()
+                    source.cancel()
+                    for worker in workers:
+                        worker.cancel()
+                    await asyncio.gather(*workers, return_exceptions=True)
+        finally:
+            self.session = None
+            self.frontier = None
+            if own_executor:
+                self.executor.shutdown()
+                self.executor = None
+
+        return [results[index] for index in range(count) if index in results]
+
+
+async def crawl_async(urls, **kwargs):
+    """
+    Scrape many websites concurrently.
+
+    Parameters:
+    urls (iterable): The URLs to scrape, or a Frontier to take them from and report progress to.
+        Consumed lazily, so it may be a generator over a large file.
+    concurrency (int): Maximum number of requests in flight overall. Default is 50.
+    per_host (int): Maximum number of requests in flight to a single host. Default is 2.
+    retries (int): The number of times to try each URL. Default is 2.
+    retry (RetryPolicy): Attempts and backoff for transient failures, overrides retries.
+    dead_letter (DeadLetter): Where URLs that failed for good are recorded.
+    transport (Transport): Connection pool and DNS cache to use, one is built from the limits if omitted.
+    pool (ExtractPool): Process pool to extract in instead of executor, for multi-core parsing.
+    ordered (bool): Deliver results to on_result in input order. Default is False.
+    timeout (int): The time (in seconds) to wait for each response. Default is 2.
+    fields (iterable): Names from FIELDS to extract. Default is all of them.
+    max_bytes (int): Stop downloading a page after this many bytes. Default is no cap.
+    extract (callable): Function turning (url, content, fields, encoding=None) into a result dict,
+        encoding being the charset of the HTTP Content-Type if there was one.
+    executor (Executor): Thread pool used for parsing when no pool is given. Created if omitted.
+    cache (ResponseCache): On-disk response cache to serve and revalidate pages from.
+    incremental (IncrementalState): Reuse the previous record of pages whose hash is unchanged.
+    on_result (callable): Called with each result as soon as it is ready, e.g. ParquetSink.write.
+    politeness (Politeness): Per-host rate limits and robots.txt rules to obey.
+    max_queued (int): URLs taken from urls but not finished yet, at most. Default is
+        no limit, or the batch size of a Frontier.
+    metrics (Metrics): Collects per-URL stage timings and sizes, see scraper.metrics.
+    collect (bool): Keep the results to return them. Turn off for crawls too big for
+        memory that hand every result to on_result, e.g. a sink. Default is True.
+
+    Returns:
+    list: The result dictionaries in input order, failed URLs left out. Empty if not collect.
+    """
+    return await Crawler(**kwargs).run(urls)
+
+
+def crawl(urls, **kwargs):
+    """
+    Blocking wrapper around crawl_async, see there for the parameters.
+    """
+    return asyncio.run(crawl_async(urls, **kwargs))
+
+
+def scrape_many(urls, fields=None, concurrency=50, max_queued=None, **kwargs):
+    """
+    Scrape many websites, yielding each result as soon as it is ready.
+
+    The crawl only advances while the generator is consumed, so a slow consumer
+    slows the crawl down instead of piling up results, and closing the generator
+    early cancels the URLs still in flight.
+
+    Parameters:
+    urls (iterable): The URLs to scrape, or a Frontier. Consumed lazily.
+    fields (iterable): Names from FIELDS to extract, e.g. ['Meta Title', 'Language'].
+        Fields that are not requested are not computed. Default is all of them.
+    concurrency (int): Maximum number of requests in flight overall. Default is 50.
+    max_queued (int): URLs taken from urls but not finished yet. Default is 4 * concurrency.
+    Other keyword arguments are passed on to crawl_async, except on_result and collect.
+
+    Yields:
+    dict: One result dictionary per successfully scraped URL, in completion order
+        (input order with ordered=True).
+    """
+    loop = asyncio.new_event_loop()
+    end = object()
+
+    async def make_queue():
+        return asyncio.Queue()
+
+    results = loop.run_until_complete(make_queue())
+
+    async def run():
+        try:
+            await crawl_async(urls, fields=fields, concurrency=concurrency,
+                              max_queued=max_queued or 4 * concurrency,
+                              on_result=results.put_nowait, collect=False, **kwargs)
+        finally:
+            results.put_nowait(end)
+
+    task = loop.create_task(run())
+    try:
+        while True:
+            result = loop.run_until_complete(results.get())
+            if result is end:
+                break
+            yield result
+        # Surfaces an exception the crawl ended with
+        loop.run_until_complete(task)
+    finally:
+        if not task.done():
+            task.cancel()
+            loop.run_until_complete(asyncio.gather(task, return_exceptions=True))
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        loop.close()
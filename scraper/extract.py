@@ -0,0 +1,110 @@
+import time
+
+from .parsers import keys_for, parse_page
+from .signatures import classify_category, detect_payment_gateways, detect_tech_stack, social_platform
+
+"""
+    Extraction half of the scraper: turns an already downloaded page into the
+    website info dictionary. Kept free of any networking so it can run in a
+    worker pool while the fetch engine keeps downloading other pages.
+"""
+
+
+#Initializing Header for request
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+
+# Every field extract_info can produce, in output column order
+FIELDS = ['Social Media Links', 'Tech Stack', 'Meta Title', 'Meta Description',
+          'Payment Gateways', 'Language', 'Category']
+
+
+class _Laps:
+    # Records the time since the previous lap under a stage name, a no-op without a timings dict
+    def __init__(self, timings):
+        self.timings = timings
+        self.last = time.perf_counter() if timings is not None else None
+
+    def __call__(self, stage):
+        if self.timings is not None:
+            now = time.perf_counter()
+            self.timings[stage] = now - self.last
+            self.last = now
+
+
+def extract_info(url, content, fields=None, backend=None, timings=None, encoding=None):
+    """
+    Extract social media links, tech stack, meta title and description,
+    payment gateways, language and category from a downloaded page.
+
+    Parameters:
+    url (str): The URL the page was fetched from.
+    content (bytes): The raw response body.
+    fields (iterable): Names from FIELDS to extract. Default is all of them.
+    backend (str): Parser backend, see scraper.parsers. Default is the fastest installed.
+    timings (dict): Filled with the seconds spent parsing ('parse') and on each field, if given.
+    encoding (str): Charset from the HTTP Content-Type, if any. See scraper.parsers.decode_page.
+
+    Returns:
+    dict: A dictionary containing the URL and the requested information.
+    """
+    fields = FIELDS if fields is None else set(fields)
+    info = {'URL': url}
+    lap = _Laps(timings)
+
+    # Parse only the tags the requested fields need, in a single traversal
+    page = parse_page(content, keys_for(fields), backend, encoding)
+    lap('parse')
+
+    #1) Extract social media links
+    if 'Social Media Links' in fields:
+        social_media_links = {}
+        for href in page['anchors']:
+            platform = social_platform(href)
+            if platform is not None:
+                social_media_links[platform] = href
+        info['Social Media Links'] = social_media_links
+        lap('Social Media Links')
+
+
+    #2) Meta Title
+    if 'Meta Title' in fields:
+        info['Meta Title'] = page['title'].strip() if page['title'] is not None else 'N/A'
+        lap('Meta Title')
+
+
+    #3) Meta Description
+    if 'Meta Description' in fields:
+        meta_description = page['description']
+        info['Meta Description'] = meta_description.strip() if meta_description is not None else 'N/A'
+        lap('Meta Description')
+
+
+    #4) Tech Stack
+    if 'Tech Stack' in fields:
+        info['Tech Stack'] = ', '.join(detect_tech_stack(page['scripts'], page['links']))
+        lap('Tech Stack')
+
+
+    #5) Payement Gateways
+    if 'Payment Gateways' in fields:
+        info['Payment Gateways'] = ', '.join(detect_payment_gateways(content))
+        lap('Payment Gateways')
+
+
+    #6) Language
+    if 'Language' in fields:
+        info['Language'] = page['lang']
+        lap('Language')
+
+
+    #7) Categories
+    if 'Category' in fields:
+        info['Category'] = classify_category(url, page['title'], page['description'], page['text'])
+        lap('Category')
+
+
+    #returning the Info of each website as Dictionary, columns in FIELDS order
+    return {field: info[field] for field in ['URL'] + FIELDS if field in info}
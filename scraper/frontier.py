@@ -0,0 +1,317 @@
+import hashlib
+import math
+import sqlite3
+import sys
+from urllib.parse import urlsplit, urlunsplit
+
+"""
+    URL frontier. Input URLs are canonicalised (scheme, host case, default
+    port, www prefix, trailing slash, fragment) and deduplicated before they
+    are queued, and redirect targets count as seen, so every site is fetched
+    and parsed once. Duplicates are caught by an in-memory Bloom filter that
+    stays a few bytes per URL however long the input is, its rare false
+    positives checked against the queue, which itself lives in SQLite: millions of URLs can be loaded from a file or
+    stdin, and a crawl that is stopped resumes where it left off.
+"""
+
+
+# Queue states of a URL
+PENDING = 0
+LEASED = 1
+DONE = 2
+FAILED = 3
+# URL reached by another URL's redirect, its result is saved under that URL
+REDIRECTED = 4
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+def canonical_url(url, default_scheme='https'):
+    """
+    Normalise a URL for fetching: lowercase scheme and host, no default port
+    or fragment, '/' for an empty path. Bare hostnames get default_scheme.
+
+    Returns:
+    str: The canonical URL, or None if url has no host.
+    """
+    url = url.strip()
+    if '://' not in url:
+        url = f'{default_scheme}://{url}'
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return None
+    host = parts.hostname
+    if not host:
+        return None
+    scheme = parts.scheme.lower()
+    netloc = host.rstrip('.')
+    if port is not None and port != DEFAULT_PORTS.get(scheme):
+        netloc = f'{netloc}:{port}'
+    return urlunsplit((scheme, netloc, parts.path or '/', parts.query, ''))
+
+
+def url_key(url):
+    """
+    Dedup key of a canonical URL: http/https, a leading 'www.' and a trailing
+    slash do not make two URLs different pages.
+    """
+    parts = urlsplit(url)
+    netloc = parts.netloc
+    if netloc.startswith('www.'):
+        netloc = netloc[4:]
+    path = parts.path.rstrip('/') or '/'
+    return f'{netloc}{path}?{parts.query}' if parts.query else f'{netloc}{path}'
+
+
+class BloomFilter:
+    """
+    Set membership in a fixed bit array, false positives possible but no false negatives.
+
+    Parameters:
+    capacity (int): Items expected. More still work, at a growing false positive rate.
+    error_rate (float): False positive rate at capacity. Default is 0.0001.
+    """
+
+    def __init__(self, capacity, error_rate=0.0001):
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item):
+        # Double hashing: k positions from the two halves of one digest
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        a = int.from_bytes(digest[:8], 'little')
+        b = int.from_bytes(digest[8:], 'little') | 1
+        return [(a + i * b) % self.size for i in range(self.hashes)]
+
+    def add(self, item):
+        """
+        Add item and return True if it was not (probably) present before.
+        """
+        new = False
+        for pos in self._positions(item):
+            byte, mask = pos >> 3, 1 << (pos & 7)
+            if not self.bits[byte] & mask:
+                self.bits[byte] |= mask
+                new = True
+        return new
+
+    def __contains__(self, item):
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
+class Frontier:
+    """
+    Persistent, deduplicated queue of the URLs of a crawl. Iterating it hands
+    out pending URLs (leasing them) and the crawl engine reports back with
+    done(), failed() and redirected().
+
+    Parameters:
+    path (str): SQLite file holding the queue. Reopening it resumes the crawl.
+    capacity (int): URLs the Bloom filter is sized for. Default is 1 million.
+    error_rate (float): Chance that a new URL is mistaken for a duplicate at capacity. Default is 0.0001.
+    batch_size (int): URLs leased per query and status updates per commit. Default is 1000.
+    """
+
+    def __init__(self, path, capacity=1000000, error_rate=0.0001, batch_size=1000):
+        self.path = path
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.batch_size = batch_size
+        self.db = sqlite3.connect(path)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('PRAGMA synchronous=NORMAL')
+        self.db.execute('''
+            CREATE TABLE IF NOT EXISTS queue (
+                id INTEGER PRIMARY KEY,
+                url TEXT NOT NULL,
+                key TEXT NOT NULL,
+                state INTEGER NOT NULL
+            )''')
+        self.db.execute('CREATE INDEX IF NOT EXISTS queue_key ON queue (key)')
+        self.db.execute('CREATE INDEX IF NOT EXISTS queue_state ON queue (state, id)')
+        # URLs handed out by a run that was stopped were never finished
+        self.db.execute('UPDATE queue SET state = ? WHERE state = ?', (PENDING, LEASED))
+        self.db.commit()
+        self.seen = BloomFilter(capacity, error_rate)
+        for (key,) in self.db.execute('SELECT key FROM queue'):
+            self.seen.add(key)
+        self.duplicates = 0
+        self.uncommitted = 0
+        # Keys of queued URLs already covered by a redirect, skipped when handed out
+        self.covered = set()
+
+    def add(self, url):
+        """
+        Queue url unless it, or a URL equal to it after canonicalisation, was seen before.
+
+        Returns:
+        bool: Whether url was queued.
+        """
+        url = canonical_url(url)
+        if url is None:
+            return False
+        key = url_key(url)
+        if not self.seen.add(key) and self._queued(key):
+            self.duplicates += 1
+            return False
+        self.db.execute('INSERT INTO queue (url, key, state) VALUES (?, ?, ?)', (url, key, PENDING))
+        self._dirty()
+        return True
+
+    def _queued(self, key):
+        # The Bloom filter only says probably seen, the indexed key column has the answer
+        return self.db.execute('SELECT 1 FROM queue WHERE key = ? LIMIT 1', (key,)).fetchone() is not None
+
+    def add_many(self, urls):
+        """
+        Queue every new URL of an iterable, committing in batches.
+
+        Returns:
+        int: How many were queued.
+        """
+        added = sum(self.add(url) for url in urls)
+        self.db.commit()
+        self.uncommitted = 0
+        return added
+
+    def load(self, path):
+        """
+        Queue the URLs of a text file, one per line, '-' reading stdin.
+        Blank lines and lines starting with '#' are skipped.
+
+        Returns:
+        int: How many were queued.
+        """
+        def lines(f):
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith('#'):
+                    yield line
+
+        if path == '-':
+            return self.add_many(lines(sys.stdin))
+        with open(path, encoding='utf-8') as f:
+            return self.add_many(lines(f))
+
+    def __iter__(self):
+        """
+        Lease and yield pending URLs in the order they were queued, batch by batch.
+        """
+        last = 0
+        while True:
+            self.db.commit()
+            self.uncommitted = 0
+            rows = self.db.execute(
+                'SELECT id, url FROM queue WHERE state = ? AND id > ? ORDER BY id LIMIT ?',
+                (PENDING, last, self.batch_size)).fetchall()
+            if not rows:
+                return
+            self.db.executemany('UPDATE queue SET state = ? WHERE id = ?', [(LEASED, row[0]) for row in rows])
+            self.db.commit()
+            last = rows[-1][0]
+            for _, url in rows:
+                if not self.covered or url_key(url) not in self.covered:
+                    yield url
+
+    def _dirty(self):
+        # Status updates are committed in batches, a crash repeats at most one batch of URLs
+        self.uncommitted += 1
+        if self.uncommitted >= self.batch_size:
+            self.db.commit()
+            self.uncommitted = 0
+
+    def _set_state(self, url, state):
+        self.db.execute('UPDATE queue SET state = ? WHERE key = ?', (state, url_key(url)))
+        self._dirty()
+
+    def done(self, url):
+        self._set_state(url, DONE)
+
+    def failed(self, url):
+        self._set_state(url, FAILED)
+
+    def reconcile(self, urls):
+        """
+        Bring a resumed queue in line with the results that were actually saved,
+        e.g. Sink.completed_urls(). Those URLs are done. A URL marked done
+        without a saved result goes back to pending, since the queue may commit
+        before a crash that loses the sink's last batch.
+
+        Returns:
+        int: How many URLs went back to pending.
+        """
+        self.db.execute('CREATE TEMP TABLE IF NOT EXISTS completed (key TEXT PRIMARY KEY)')
+        self.db.execute('DELETE FROM temp.completed')
+        keys = (url_key(url) for url in map(canonical_url, urls) if url is not None)
+        self.db.executemany('INSERT OR IGNORE INTO temp.completed VALUES (?)', ((key,) for key in keys))
+        reset = self.db.execute(
+            'UPDATE queue SET state = ? WHERE state = ? AND key NOT IN (SELECT key FROM temp.completed)',
+            (PENDING, DONE)).rowcount
+        self.db.execute('UPDATE queue SET state = ? WHERE state != ? AND key IN (SELECT key FROM temp.completed)',
+                        (DONE, DONE))
+        self.db.execute('DROP TABLE temp.completed')
+        self.db.commit()
+        self.uncommitted = 0
+        return reset
+
+    def redirected(self, url, final):
+        """
+        Record that url redirected to final, so final is not queued or fetched again.
+        """
+        final = canonical_url(final)
+        if final is None:
+            return
+        key = url_key(final)
+        if key == url_key(url):
+            return
+        if not self.seen.add(key) and self._queued(key):
+            # A copy of the target waiting in the queue is already covered by url
+            cursor = self.db.execute('UPDATE queue SET state = ? WHERE key = ? AND state IN (?, ?)',
+                                     (REDIRECTED, key, PENDING, LEASED))
+            if cursor.rowcount:
+                self.covered.add(key)
+        else:
+            # Stored so the target still counts as seen when it is added later, or after a restart
+            self.db.execute('INSERT INTO queue (url, key, state) VALUES (?, ?, ?)', (final, key, REDIRECTED))
+        self._dirty()
+
+    def counts(self):
+        """
+        Number of URLs per state, plus the duplicates dropped while adding.
+        """
+        names = {PENDING: 'pending', LEASED: 'leased', DONE: 'done', FAILED: 'failed', REDIRECTED: 'redirected'}
+        counts = {name: 0 for name in names.values()}
+        for state, count in self.db.execute('SELECT state, COUNT(*) FROM queue GROUP BY state'):
+            counts[names[state]] = count
+        counts['duplicates'] = self.duplicates
+        return counts
+
+    def __len__(self):
+        return self.db.execute('SELECT COUNT(*) FROM queue').fetchone()[0]
+
+    def unfinished(self):
+        """
+        Number of URLs still to crawl, 0 once a crawl has completed.
+        """
+        return self.db.execute('SELECT COUNT(*) FROM queue WHERE state IN (?, ?)', (PENDING, LEASED)).fetchone()[0]
+
+    def clear(self):
+        """
+        Drop every URL, to start a new crawl in the same file.
+        """
+        self.db.execute('DELETE FROM queue')
+        self.db.commit()
+        self.seen = BloomFilter(self.capacity, self.error_rate)
+
+    def close(self):
+        self.db.commit()
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
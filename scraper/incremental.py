@@ -0,0 +1,162 @@
+import csv
+import json
+import os
+import sqlite3
+import time
+
+from .extract import FIELDS
+
+"""
+    Incremental re-scrape support. The SHA-256 of every page body is kept next
+    to its extracted record in a SQLite state file. On the next run a page
+    whose hash has not changed reuses the stored record instead of being
+    parsed again, so a refresh only pays extraction for the pages that churned.
+    Records are looked up and written one page at a time and every change is
+    appended to the change log as it happens, so memory stays flat however
+    many pages the crawl covers.
+"""
+
+
+# Columns of the change log CSV
+CHANGE_FIELDS = ['URL', 'Status', 'Previous Hash', 'Hash', 'Checked At']
+
+
+class IncrementalState:
+    """
+    Page hashes and records of an incremental crawl, previous runs and this one.
+
+    Parameters:
+    path (str): SQLite state file, created if it does not exist.
+    changelog_path (str): CSV every new, changed, unchanged or failed page is appended to. Default is None, no log.
+    resume (bool): Continue an interrupted run, keeping the failures it already recorded. Default is False.
+    batch_size (int): Updates per commit. Default is 1000.
+    """
+
+    def __init__(self, path, changelog_path=None, resume=False, batch_size=1000):
+        self.path = path
+        self.batch_size = batch_size
+        self.db = sqlite3.connect(path)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('PRAGMA synchronous=NORMAL')
+        # status is this run's outcome, NULL for pages not checked yet
+        self.db.execute('''
+            CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY,
+                hash TEXT,
+                record TEXT,
+                status TEXT
+            )''')
+        if not resume:
+            self.db.execute('UPDATE pages SET status = NULL')
+        self.db.commit()
+        self.uncommitted = 0
+        self.status_counts = {}
+        self.changelog = None
+        if changelog_path is not None:
+            new_file = not os.path.exists(changelog_path) or os.path.getsize(changelog_path) == 0
+            self.changelog = open(changelog_path, 'a', newline='', encoding='utf-8')
+            self.writer = csv.DictWriter(self.changelog, fieldnames=CHANGE_FIELDS)
+            if new_file:
+                self.writer.writeheader()
+
+    def _previous(self, url):
+        return self.db.execute('SELECT hash, record FROM pages WHERE url = ?', (url,)).fetchone()
+
+    def reuse(self, url, digest):
+        """
+        Return the stored record for url if its page hash is unchanged, else None.
+        """
+        if digest is None:
+            return None
+        row = self._previous(url)
+        if row is not None and row[0] == digest and row[1] is not None:
+            return json.loads(row[1])
+        return None
+
+    def update(self, url, digest, record):
+        """
+        Store the outcome for url and log whether it is new, changed or unchanged.
+        Only a record with every field is stored, the one a later crawl of any fields can reuse.
+        """
+        row = self._previous(url)
+        if row is None:
+            status = 'new'
+        elif digest is not None and row[0] == digest:
+            status = 'unchanged'
+        else:
+            status = 'changed'
+        if record is not None and all(field in record for field in FIELDS):
+            stored = json.dumps(record)
+        elif status == 'unchanged':
+            # A crawl of fewer fields keeps the full record of an unchanged page
+            self.db.execute('UPDATE pages SET status = ? WHERE url = ?', (status, url))
+            self._log(url, status, row, digest)
+            return
+        else:
+            # The page changed, the stored record is stale and there is no full one to replace it
+            stored = None
+        self.db.execute('''
+            INSERT INTO pages (url, hash, record, status) VALUES (?, ?, ?, ?)
+            ON CONFLICT (url) DO UPDATE SET hash = excluded.hash, record = excluded.record, status = excluded.status
+            ''', (url, digest, stored, status))
+        self._log(url, status, row, digest)
+
+    def failed(self, url):
+        # The previous record is kept, see carried_over()
+        row = self._previous(url)
+        if row is not None:
+            self.db.execute('UPDATE pages SET status = ? WHERE url = ?', ('failed', url))
+        self._log(url, 'failed', row, None)
+
+    def _log(self, url, status, row, digest):
+        self.status_counts[status] = self.status_counts.get(status, 0) + 1
+        if self.changelog is not None:
+            self.writer.writerow({
+                'URL': url,
+                'Status': status,
+                'Previous Hash': (row[0] or '') if row is not None else '',
+                'Hash': digest or '',
+                'Checked At': time.strftime('%Y-%m-%d %H:%M:%S'),
+            })
+        self._dirty()
+
+    def _dirty(self):
+        # Updates are committed in batches, a crash loses at most one batch of hashes
+        self.uncommitted += 1
+        if self.uncommitted >= self.batch_size:
+            self.save()
+
+    def carried_over(self):
+        """
+        Previous records of URLs that failed in this run, to keep them in the output.
+        """
+        self.save()
+        query = 'SELECT record FROM pages WHERE status = ? AND record IS NOT NULL ORDER BY rowid'
+        for (record,) in self.db.execute(query, ('failed',)):
+            record = json.loads(record)
+            if record is not None:
+                yield record
+
+    def counts(self):
+        return dict(self.status_counts)
+
+    def save(self):
+        """
+        Commit the pending updates and flush the change log.
+        """
+        self.db.commit()
+        self.uncommitted = 0
+        if self.changelog is not None:
+            self.changelog.flush()
+
+    def close(self):
+        self.save()
+        self.db.close()
+        if self.changelog is not None:
+            self.changelog.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
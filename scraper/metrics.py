@@ -0,0 +1,252 @@
+import bisect
+import cProfile
+import io
+import json
+import os
+import pstats
+import threading
+import time
+
+"""
+    Per-stage instrumentation. Every scraped URL carries a Sample that the
+    transport (DNS, connect, waiting for headers), the engine (body transfer,
+    cache reads) and the extract step (parsing and each field) fill with
+    their durations. Samples are folded into fixed-bucket histograms, so
+    memory does not grow with the crawl, optionally written one JSON line per
+    URL, and exported as a Prometheus text file or JSON with percentiles.
+    A cProfile hook can be switched on for the extract stage.
+"""
+
+
+# Upper bounds of the duration buckets in seconds, 0.25 ms doubling up to about 4 minutes
+SECONDS_BUCKETS = [0.00025 * 2 ** i for i in range(21)]
+
+# Upper bounds of the body size buckets in bytes, 1 KB doubling up to 64 MB
+BYTES_BUCKETS = [1024 * 2 ** i for i in range(17)]
+
+# Percentiles reported by summaries and the JSON export
+PERCENTILES = (50, 90, 99)
+
+
+class Histogram:
+    """
+    Counts of observations per bucket, Prometheus style, with their sum, min and max.
+
+    Parameters:
+    bounds (list): Ascending upper bounds of the buckets, one overflow bucket is added.
+    """
+
+    def __init__(self, bounds):
+        self.bounds = list(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def percentile(self, p):
+        """
+        Estimate the p-th percentile, interpolating linearly inside its bucket.
+        """
+        if not self.count:
+            return None
+        rank = p / 100 * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                lower = self.bounds[i - 1] if i > 0 else 0.0
+                upper = self.bounds[i] if i < len(self.bounds) else self.max
+                value = lower + (upper - lower) * (rank - seen) / count
+                return min(max(value, self.min), self.max)
+            seen += count
+        return self.max
+
+    def summary(self):
+        summary = {'count': self.count, 'sum': self.sum, 'min': self.min, 'max': self.max,
+                   'mean': self.sum / self.count if self.count else None}
+        for p in PERCENTILES:
+            summary[f'p{p}'] = self.percentile(p)
+        return summary
+
+
+class Sample:
+    """
+    Stage durations and size of one scraped URL, filled in as the page goes through the pipeline.
+    """
+
+    def __init__(self, url):
+        self.url = url
+        self.stages = {}
+        self.bytes = None
+        self.source = 'network'
+        self.started = time.perf_counter()
+
+    def add(self, stage, seconds):
+        # Redirects make several requests for one URL, their times add up
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+
+def timed_extract(extract, url, content, fields, detail=False, encoding=None):
+    """
+    Run an extract function and time it, optionally with the breakdown of extract_info.
+
+    Parameters:
+    detail (bool): Pass a timings dict to extract for parse and per-field times. Default is False.
+    encoding (str): Charset from the HTTP headers, passed on to extract.
+
+    Returns:
+    tuple: (result dict, {stage: seconds}).
+    """
+    timings = {}
+    started = time.perf_counter()
+    if detail:
+        info = extract(url, content, fields, timings=timings, encoding=encoding)
+    else:
+        info = extract(url, content, fields, encoding=encoding)
+    timings['extract'] = time.perf_counter() - started
+    return info, timings
+
+
+class Metrics:
+    """
+    Collects the Samples of a crawl into per-stage histograms.
+
+    Parameters:
+    trace_path (str): JSON lines file getting one line per URL with its stage times. Default is none.
+    detail (bool): Break the extract stage down into parsing and each field. Needs an
+        extract function with a timings parameter like extract_info. Default is True.
+    profile (bool): Run cProfile around extraction done in this process, see print_profile.
+        Pages extracted by an ExtractPool are not profiled. Default is False.
+    """
+
+    def __init__(self, trace_path=None, detail=True, profile=False):
+        self.detail = detail
+        self.profile = profile
+        self.stages = {}
+        self.bytes = Histogram(BYTES_BUCKETS)
+        self.pages = {}
+        self.failures = 0
+        self.started = time.time()
+        self.trace = open(trace_path, 'a', encoding='utf-8') if trace_path else None
+        self.profile_stats = None
+        self.profile_lock = threading.Lock()
+
+    def observe(self, sample):
+        """
+        Add the stage times of a finished URL.
+        """
+        sample.add('total', time.perf_counter() - sample.started)
+        for stage, seconds in sample.stages.items():
+            histogram = self.stages.get(stage)
+            if histogram is None:
+                histogram = self.stages[stage] = Histogram(SECONDS_BUCKETS)
+            histogram.observe(seconds)
+        if sample.bytes is not None:
+            self.bytes.observe(sample.bytes)
+        self.pages[sample.source] = self.pages.get(sample.source, 0) + 1
+        if self.trace is not None:
+            self.trace.write(json.dumps({'url': sample.url, 'source': sample.source,
+                                         'bytes': sample.bytes, **sample.stages}) + '\n')
+
+    def failed(self, url):
+        self.failures += 1
+
+    def profiled(self, func, *args):
+        """
+        Call func(*args) under cProfile and merge its profile into the crawl's.
+        """
+        profiler = cProfile.Profile()
+        try:
+            return profiler.runcall(func, *args)
+        finally:
+            with self.profile_lock:
+                if self.profile_stats is None:
+                    self.profile_stats = pstats.Stats(profiler)
+                else:
+                    self.profile_stats.add(profiler)
+
+    def print_profile(self, limit=25, sort='cumulative'):
+        """
+        The top functions of the extract profile as text, empty if profiling was off.
+        """
+        if self.profile_stats is None:
+            return ''
+        out = io.StringIO()
+        self.profile_stats.stream = out
+        self.profile_stats.sort_stats(sort).print_stats(limit)
+        return out.getvalue()
+
+    def as_dict(self):
+        return {
+            'started_at': time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(self.started)),
+            'elapsed': time.time() - self.started,
+            'pages': dict(self.pages),
+            'failures': self.failures,
+            'stages': {stage: histogram.summary() for stage, histogram in self.stages.items()},
+            'bytes': self.bytes.summary(),
+        }
+
+    def report(self):
+        """
+        One line per stage with count, mean and percentiles in milliseconds.
+        """
+        lines = [f"Metrics: {sum(self.pages.values())} pages {self.pages}, {self.failures} failed"]
+        for stage, histogram in sorted(self.stages.items()):
+            s = histogram.summary()
+            lines.append(f"  {stage:<24} n={s['count']:<6} mean={s['mean'] * 1000:8.1f}ms "
+                         + ' '.join(f"p{p}={s[f'p{p}'] * 1000:8.1f}ms" for p in PERCENTILES))
+        return '\n'.join(lines)
+
+    def to_json(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.as_dict(), f, indent=2)
+
+    def to_prometheus(self, path, prefix='scraper'):
+        """
+        Write the histograms and counters in the Prometheus text exposition format,
+        e.g. for the node_exporter textfile collector.
+        """
+        lines = [f'# HELP {prefix}_stage_seconds Time spent per URL in each stage.',
+                 f'# TYPE {prefix}_stage_seconds histogram']
+        for stage, histogram in sorted(self.stages.items()):
+            lines += _prometheus_histogram(f'{prefix}_stage_seconds', histogram, f'stage="{stage}"')
+        lines += [f'# HELP {prefix}_page_bytes Downloaded body size per page.',
+                  f'# TYPE {prefix}_page_bytes histogram']
+        lines += _prometheus_histogram(f'{prefix}_page_bytes', self.bytes)
+        lines += [f'# HELP {prefix}_pages_total Pages scraped by where the body came from.',
+                  f'# TYPE {prefix}_pages_total counter']
+        lines += [f'{prefix}_pages_total{{source="{source}"}} {count}' for source, count in sorted(self.pages.items())]
+        lines += [f'# HELP {prefix}_failures_total URLs that failed for good.',
+                  f'# TYPE {prefix}_failures_total counter',
+                  f'{prefix}_failures_total {self.failures}']
+        tmp = f'{path}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+        # Scrapers must never see a half written file
+        os.replace(tmp, path)
+
+    def close(self):
+        if self.trace is not None:
+            self.trace.close()
+            self.trace = None
+
+
+def _prometheus_histogram(name, histogram, labels=''):
+    sep = ',' if labels else ''
+    lines = []
+    cumulative = 0
+    for bound, count in zip(histogram.bounds, histogram.counts):
+        cumulative += count
+        lines.append(f'{name}_bucket{{{labels}{sep}le="{float(bound)!r}"}} {cumulative}')
+    lines.append(f'{name}_bucket{{{labels}{sep}le="+Inf"}} {histogram.count}')
+    suffix = f'{{{labels}}}' if labels else ''
+    lines.append(f'{name}_sum{suffix} {float(histogram.sum)!r}')
+    lines.append(f'{name}_count{suffix} {histogram.count}')
+    return lines
@@ -0,0 +1,51 @@
+from .extract import FIELDS
+
+"""
+    Columnar output. Results are written to Parquet with real list and map
+    columns instead of stringified dicts and comma-joined strings, and with
+    dictionary-encoded Language and Category. The schema and row conversion
+    here are used by ParquetSink, which writes the rows while the crawl runs.
+"""
+
+
+# Fields stored as a list of names instead of a comma-joined string
+LIST_FIELDS = {'Tech Stack', 'Payment Gateways'}
+
+# Low-cardinality fields stored dictionary-encoded
+CATEGORICAL_FIELDS = {'Language', 'Category'}
+
+
+def schema_for(fields=None):
+    """
+    Arrow schema for records holding the given fields. Default is all of them.
+    """
+    import pyarrow as pa
+
+    types = {
+        'URL': pa.string(),
+        'Social Media Links': pa.map_(pa.string(), pa.string()),
+        'Tech Stack': pa.list_(pa.string()),
+        'Meta Title': pa.string(),
+        'Meta Description': pa.string(),
+        'Payment Gateways': pa.list_(pa.string()),
+        'Language': pa.dictionary(pa.int32(), pa.string()),
+        'Category': pa.dictionary(pa.int32(), pa.string()),
+    }
+    fields = FIELDS if fields is None else fields
+    return pa.schema([(name, types[name]) for name in ['URL'] + FIELDS if name == 'URL' or name in fields])
+
+
+def normalise(record):
+    """
+    Convert a result dictionary to typed column values.
+    """
+    row = dict(record)
+    for name in LIST_FIELDS:
+        value = row.get(name)
+        if isinstance(value, str):
+            row[name] = value.split(', ') if value else []
+    links = row.get('Social Media Links')
+    if isinstance(links, dict):
+        row['Social Media Links'] = list(links.items())
+    return row
+
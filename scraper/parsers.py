@@ -0,0 +1,336 @@
+import codecs
+import re
+from html.parser import HTMLParser
+
+"""
+    Pluggable HTML parser backends. Every backend gathers all the tags the
+    extractors use in a single traversal and returns them as a plain page dict:
+
+        title        text of the first <title>, or None
+        description  content of <meta name="description">, or None
+        lang         lang attribute of <html>, None if absent, 'N/A' without <html>
+        anchors      href of every <a href>
+        scripts      src of every <script src>
+        links        href of every <link href>
+        text         visible body text, at most MAX_TEXT characters
+
+    selectolax and lxml are used when installed, the standard library
+    html.parser is the fallback that is always available. The raw body is
+    decoded once, before any backend sees it (see decode_page), so every
+    backend reads the same text whatever its own charset handling would do.
+"""
+
+
+# Page keys each extracted field reads, fields missing here need no parsing
+FIELD_KEYS = {
+    'Social Media Links': ['anchors'],
+    'Tech Stack': ['scripts', 'links'],
+    'Meta Title': ['title'],
+    'Meta Description': ['description'],
+    'Language': ['lang'],
+    'Category': ['title', 'description', 'text'],
+}
+
+# Visible text kept per page for classification, the start of a page says the most
+MAX_TEXT = 20000
+
+# Tags whose contents are never visible text
+INVISIBLE_TAGS = ('script', 'style', 'noscript', 'template')
+
+# Tag each page key is read from
+KEY_TAGS = {
+    'title': 'title',
+    'description': 'meta',
+    'lang': 'html',
+    'anchors': 'a',
+    'scripts': 'script',
+    'links': 'link',
+    'text': 'body',
+}
+
+
+# Browsers look for a <meta> charset in the first 1024 bytes
+SNIFF_BYTES = 1024
+META_CHARSET = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?\s*([a-z0-9_.:-]+)', re.IGNORECASE)
+BOMS = [(codecs.BOM_UTF8, 'utf-8'), (codecs.BOM_UTF16_LE, 'utf-16-le'), (codecs.BOM_UTF16_BE, 'utf-16-be')]
+
+# An <html> start tag, its absence is what makes lang 'N/A'
+HTML_TAG = re.compile(r'<html[\s>/]', re.IGNORECASE)
+
+
+def _codec(name):
+    # Python codec for a charset label, None if unknown. Like browsers, latin-1 and ascii mean windows-1252
+    try:
+        name = codecs.lookup(name.strip()).name
+    except (LookupError, ValueError):
+        return None
+    return 'cp1252' if name in ('latin-1', 'iso8859-1', 'ascii') else name
+
+
+def decode_page(content, encoding=None):
+    """
+    Decode a raw body the way browsers pick its charset: byte order mark, the
+    charset of the HTTP Content-Type, a <meta> charset near the top, then
+    UTF-8 if the bytes are valid UTF-8 and windows-1252 otherwise.
+
+    Parameters:
+    content (bytes): The raw response body. Text is returned unchanged.
+    encoding (str): Charset from the HTTP headers, if any.
+
+    Returns:
+    str: The page text.
+    """
+    if isinstance(content, str):
+        return content
+    for bom, codec in BOMS:
+        if content.startswith(bom):
+            return content[len(bom):].decode(codec, errors='replace')
+    codec = _codec(encoding) if encoding else None
+    if codec is None:
+        match = META_CHARSET.search(content, 0, SNIFF_BYTES)
+        if match is not None:
+            codec = _codec(match.group(1).decode('ascii'))
+            # A page that got this far is ASCII compatible, whatever its <meta> says
+            if codec is not None and codec.startswith('utf-16'):
+                codec = 'utf-8'
+    if codec is None:
+        try:
+            # Not final: a body cut short may end inside a character
+            codecs.getincrementaldecoder('utf-8')().decode(content)
+            codec = 'utf-8'
+        except UnicodeDecodeError:
+            codec = 'cp1252'
+    return content.decode(codec, errors='replace')
+
+
+def _html_lang(lang, text):
+    # lang of a parsed document, 'N/A' when the page has no <html> tag of its own
+    if lang is None and HTML_TAG.search(text) is None:
+        return 'N/A'
+    return lang
+
+
+def keys_for(fields):
+    """
+    Return the set of page keys needed to extract the given fields.
+    """
+    return {key for field in fields for key in FIELD_KEYS.get(field, [])}
+
+
+def _empty_page():
+    return {'title': None, 'description': None, 'lang': 'N/A',
+            'anchors': [], 'scripts': [], 'links': [], 'text': ''}
+
+
+class _Collector(HTMLParser):
+    """
+    Streaming collector for the html.parser backend, no tree is built at all.
+    """
+
+    def __init__(self, keys):
+        super().__init__(convert_charrefs=True)
+        self.keys = keys
+        self.page = _empty_page()
+        self.in_title = False
+        self.title = []
+        self.want_text = 'text' in keys
+        self.text = []
+        self.text_size = 0
+        self.hidden = 0
+
+    def handle_starttag(self, tag, attrs):
+        page = self.page
+        if tag in INVISIBLE_TAGS:
+            self.hidden += 1
+        if tag == 'a':
+            if 'anchors' in self.keys:
+                href = dict(attrs).get('href')
+                if href is not None:
+                    page['anchors'].append(href)
+        elif tag == 'script':
+            if 'scripts' in self.keys:
+                src = dict(attrs).get('src')
+                if src is not None:
+                    page['scripts'].append(src)
+        elif tag == 'link':
+            if 'links' in self.keys:
+                href = dict(attrs).get('href')
+                if href is not None:
+                    page['links'].append(href)
+        elif tag == 'meta':
+            if page['description'] is None:
+                attrs = dict(attrs)
+                if (attrs.get('name') or '').lower() == 'description':
+                    page['description'] = attrs.get('content') or ''
+        elif tag == 'title':
+            if page['title'] is None:
+                self.in_title = True
+        elif tag == 'html':
+            if page['lang'] == 'N/A':
+                page['lang'] = dict(attrs).get('lang')
+
+    def handle_endtag(self, tag):
+        if tag in INVISIBLE_TAGS and self.hidden:
+            self.hidden -= 1
+        if tag == 'title' and self.in_title:
+            self.in_title = False
+            self.page['title'] = ''.join(self.title)
+
+    def handle_data(self, data):
+        if self.in_title:
+            self.title.append(data)
+        elif self.want_text and not self.hidden and self.text_size < MAX_TEXT:
+            self.text.append(data)
+            self.text_size += len(data)
+
+
+def parse_html_parser(text, keys):
+    collector = _Collector(keys)
+    collector.feed(text)
+    collector.close()
+    if collector.in_title:
+        collector.page['title'] = ''.join(collector.title)
+    collector.page['text'] = ' '.join(collector.text)[:MAX_TEXT]
+    return collector.page
+
+
+def parse_lxml(text, keys):
+    import lxml.html
+    from lxml.etree import ParserError
+
+    page = _empty_page()
+    try:
+        try:
+            root = lxml.html.document_fromstring(text)
+        except ValueError:
+            # Text starting with an <?xml encoding=...?> declaration has to go in as bytes
+            root = lxml.html.document_fromstring(text.encode('utf-8'), parser=lxml.html.HTMLParser(encoding='utf-8'))
+    except ParserError:
+        return page
+    if root.tag == 'html':
+        page['lang'] = _html_lang(root.get('lang'), text)
+    tags = {KEY_TAGS[key] for key in keys} - {'html', 'body'}
+    for node in root.iter(*tags):
+        tag = node.tag
+        if tag == 'a':
+            href = node.get('href')
+            if href is not None:
+                page['anchors'].append(href)
+        elif tag == 'script':
+            src = node.get('src')
+            if src is not None:
+                page['scripts'].append(src)
+        elif tag == 'link':
+            href = node.get('href')
+            if href is not None:
+                page['links'].append(href)
+        elif tag == 'meta':
+            if page['description'] is None and (node.get('name') or '').lower() == 'description':
+                page['description'] = node.get('content') or ''
+        elif tag == 'title':
+            if page['title'] is None:
+                page['title'] = node.text_content()
+    if 'text' in keys:
+        page['text'] = _lxml_text(root)
+    return page
+
+
+def _lxml_text(root):
+    body = root.find('body')
+    if body is None:
+        return ''
+    parts = []
+    size = 0
+    for text in body.xpath('.//text()[not(ancestor::script or ancestor::style or ancestor::noscript '
+                           'or ancestor::template)]'):
+        parts.append(text)
+        size += len(text)
+        if size >= MAX_TEXT:
+            break
+    return ' '.join(parts)[:MAX_TEXT]
+
+
+def parse_selectolax(text, keys):
+    from selectolax.lexbor import LexborHTMLParser
+
+    page = _empty_page()
+    tree = LexborHTMLParser(text)
+    root = tree.root
+    if root is not None and root.tag == 'html':
+        page['lang'] = _html_lang(root.attributes.get('lang'), text)
+    selectors = {
+        'title': 'title',
+        'description': 'meta[name]',
+        'anchors': 'a[href]',
+        'scripts': 'script[src]',
+        'links': 'link[href]',
+    }
+    query = ', '.join(selectors[key] for key in keys if key in selectors)
+    # One combined selector walks the tree once, nodes come back in document order
+    for node in (tree.css(query) if query else []):
+        tag = node.tag
+        if tag == 'a':
+            page['anchors'].append(node.attributes['href'])
+        elif tag == 'script':
+            page['scripts'].append(node.attributes['src'])
+        elif tag == 'link':
+            page['links'].append(node.attributes['href'])
+        elif tag == 'meta':
+            if page['description'] is None and (node.attributes.get('name') or '').lower() == 'description':
+                page['description'] = node.attributes.get('content') or ''
+        elif tag == 'title':
+            if page['title'] is None:
+                page['title'] = node.text()
+    if 'text' in keys and tree.body is not None:
+        # Dropping invisible subtrees is fine now that the tags above were collected
+        tree.strip_tags(list(INVISIBLE_TAGS))
+        page['text'] = tree.body.text(separator=' ')[:MAX_TEXT]
+    return page
+
+
+# Backends in order of preference
+BACKENDS = {
+    'selectolax': parse_selectolax,
+    'lxml': parse_lxml,
+    'html.parser': parse_html_parser,
+}
+
+_MODULES = {'selectolax': 'selectolax.lexbor', 'lxml': 'lxml.html'}
+
+
+def available_backends():
+    """
+    Return the names of the backends whose library is installed, fastest first.
+    """
+    names = []
+    for name in BACKENDS:
+        module = _MODULES.get(name)
+        if module is not None:
+            try:
+                __import__(module)
+            except ImportError:
+                continue
+        names.append(name)
+    return names
+
+
+DEFAULT_BACKEND = available_backends()[0]
+
+
+def parse_page(content, keys, backend=None, encoding=None):
+    """
+    Parse a downloaded page with the chosen backend.
+
+    Parameters:
+    content (bytes): The raw response body, or text already decoded.
+    keys (iterable): Page keys to gather, see keys_for.
+    backend (str): Name from BACKENDS. Default is the fastest one installed.
+    encoding (str): Charset from the HTTP headers, see decode_page.
+
+    Returns:
+    dict: The page dict described at the top of this module.
+    """
+    keys = set(keys)
+    if not keys:
+        return _empty_page()
+    return BACKENDS[backend or DEFAULT_BACKEND](decode_page(content, encoding), keys)
@@ -0,0 +1,301 @@
+import asyncio
+import heapq
+import math
+import time
+from collections import deque
+from urllib.parse import urlsplit
+from urllib.robotparser import RobotFileParser
+
+import aiohttp
+
+"""
+    Politeness scheduling. Every host gets its own token bucket, slowed down
+    further by the Crawl-delay of its robots.txt, and URLs are handed out in
+    order of when their host may be hit next. Hosts are interleaved so the
+    crawl as a whole stays busy while each domain only sees a polite rate.
+    A host's robots.txt is read before its first URL is handed out, so its
+    Crawl-delay already paces the second request.
+"""
+
+
+def host_of(url):
+    return urlsplit(url).netloc.lower()
+
+
+class TokenBucket:
+    """
+    Token bucket refilled at rate tokens per second, holding at most burst tokens.
+    """
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.min_interval = 0.0
+        self.last = None
+
+    def reserve(self):
+        """
+        Take one token and return the monotonic time at which it may be used.
+        """
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+        at = now if self.tokens >= 0 else now - self.tokens / self.rate
+        # Crawl-delay is a hard minimum gap between requests, bursts included
+        if self.last is not None:
+            at = max(at, self.last + self.min_interval)
+        self.last = at
+        return at
+
+
+class HostScheduler:
+    """
+    Hands out queued items host by host, each host paced by its own TokenBucket.
+
+    Parameters:
+    rate (float): Requests per second allowed to a single host. Default is 1.
+    burst (int): Requests a host may receive back to back. Default is 2.
+    prepare (callable): Coroutine function awaited with the first URL of every
+        new host before any of its items is handed out, e.g. to read robots.txt.
+    """
+
+    def __init__(self, rate=1.0, burst=2, prepare=None):
+        self.rate = rate
+        self.burst = burst
+        self.prepare = prepare
+        self.queues = {}
+        self.buckets = {}
+        self.ready = []
+        self.seq = 0
+        self.closed = False
+        self.changed = asyncio.Event()
+        # Hosts whose prepare() is still running, their queues are not in ready yet
+        self.preparing = {}
+
+    def bucket(self, host):
+        if host not in self.buckets:
+            self.buckets[host] = TokenBucket(self.rate, self.burst)
+        return self.buckets[host]
+
+    def put(self, item, url):
+        host = host_of(url)
+        queue = self.queues.get(host)
+        if queue is None:
+            queue = self.queues[host] = deque()
+            if self.prepare is not None and host not in self.buckets:
+                self.preparing[host] = asyncio.ensure_future(self._prepare(host, url))
+            else:
+                self._schedule(host)
+        queue.append(item)
+        self.changed.set()
+
+    def _schedule(self, host):
+        self.seq += 1
+        heapq.heappush(self.ready, (self.bucket(host).reserve(), self.seq, host))
+
+    async def _prepare(self, host, url):
+        try:
+            await self.prepare(url)
+        except Exception:
+            # The item goes out anyway, the worker handling it reports the failure
+            pass
+        finally:
+            del self.preparing[host]
+            self._schedule(host)
+            self.changed.set()
+
+    def close(self):
+        """
+        No more items will be put, get() returns None once everything is handed out.
+        """
+        self.closed = True
+        self.changed.set()
+
+    def cancel(self):
+        """
+        Stop the prepare() calls still running, for a crawl that ends early.
+        """
+        for task in list(self.preparing.values()):
+            task.cancel()
+
+    def set_crawl_delay(self, host, delay):
+        self.bucket(host).min_interval = delay
+
+    async def get(self):
+        while True:
+            if not self.ready:
+                if self.closed and not self.preparing:
+                    return None
+                self.changed.clear()
+                await self.changed.wait()
+                continue
+            at, seq, host = self.ready[0]
+            delay = at - time.monotonic()
+            if delay > 0:
+                # Wake up early if an earlier host is scheduled meanwhile. A timer rather than
+                # wait_for, which can swallow a cancellation arriving as the timeout expires
+                self.changed.clear()
+                timer = asyncio.get_running_loop().call_later(delay, self.changed.set)
+                try:
+                    await self.changed.wait()
+                finally:
+                    timer.cancel()
+                continue
+            heapq.heappop(self.ready)
+            queue = self.queues[host]
+            item = queue.popleft()
+            if queue:
+                heapq.heappush(self.ready, (self.bucket(host).reserve(), seq, host))
+            else:
+                del self.queues[host]
+            return item
+
+
+class RobotRules(RobotFileParser):
+    """
+    RobotFileParser that keeps decimal Crawl-delay values such as 0.5, which
+    the standard library parser drops.
+    """
+
+    delays = ()
+
+    def parse(self, lines):
+        lines = list(lines)
+        super().parse(lines)
+        # (user agents of a group, its Crawl-delay), groups as the standard library forms them
+        self.delays = []
+        agents = []
+        in_rules = False
+        for line in lines:
+            key, sep, value = line.split('#', 1)[0].partition(':')
+            if not sep:
+                continue
+            key = key.strip().lower()
+            value = value.strip()
+            if key == 'user-agent':
+                if in_rules:
+                    agents = []
+                    in_rules = False
+                agents.append(value.lower())
+            elif key in ('allow', 'disallow', 'crawl-delay', 'request-rate'):
+                in_rules = True
+                if key == 'crawl-delay' and agents:
+                    try:
+                        delay = float(value)
+                    except ValueError:
+                        continue
+                    if math.isfinite(delay) and delay >= 0:
+                        self.delays.append((agents, delay))
+
+    def crawl_delay(self, useragent):
+        # Same matching as RobotFileParser: a named group wins over '*'
+        name = useragent.split('/')[0].lower()
+        default = None
+        for agents, delay in self.delays:
+            if '*' in agents:
+                if default is None:
+                    default = delay
+            elif any(agent in name for agent in agents):
+                return delay
+        return default
+
+
+class RobotsCache:
+    """
+    robots.txt of every host, fetched once and kept for ttl seconds.
+
+    Parameters:
+    user_agent (str): Agent name the rules are evaluated for.
+    ttl (int): Seconds a fetched robots.txt stays valid. Default is 1 day.
+    timeout (int): The time (in seconds) to wait for robots.txt. Default is 5.
+    """
+
+    def __init__(self, user_agent, ttl=24 * 3600, timeout=5):
+        self.user_agent = user_agent
+        self.ttl = ttl
+        self.timeout = timeout
+        self.entries = {}
+        self.pending = {}
+
+    async def _download(self, session, root):
+        parser = RobotRules()
+        try:
+            async with session.get(f'{root}/robots.txt',
+                                   timeout=aiohttp.ClientTimeout(total=self.timeout)) as response:
+                if response.status in (401, 403):
+                    parser.disallow_all = True
+                elif response.status >= 400:
+                    parser.allow_all = True
+                else:
+                    text = await response.text(errors='replace')
+                    parser.parse(text.splitlines())
+        except (aiohttp.ClientError, asyncio.TimeoutError, UnicodeDecodeError):
+            # An unreachable robots.txt is treated as no restrictions
+            parser.allow_all = True
+        return parser
+
+    async def get(self, session, url):
+        """
+        Return the RobotRules for the host of url, downloading it at most once per ttl.
+        """
+        parts = urlsplit(url)
+        root = f'{parts.scheme}://{parts.netloc}'
+        entry = self.entries.get(root)
+        if entry is not None and time.monotonic() - entry[1] < self.ttl:
+            return entry[0]
+        # Concurrent requests for the same host share one download
+        task = self.pending.get(root)
+        if task is None:
+            task = self.pending[root] = asyncio.ensure_future(self._download(session, root))
+        try:
+            parser = await task
+        finally:
+            self.pending.pop(root, None)
+        self.entries[root] = (parser, time.monotonic())
+        return parser
+
+
+class Politeness:
+    """
+    Politeness settings of a crawl.
+
+    Parameters:
+    rate (float): Requests per second allowed to a single host. Default is 1.
+    burst (int): Requests a host may receive back to back. Default is 2.
+    robots (bool): Honour robots.txt rules and Crawl-delay. Default is True.
+    robots_ttl (int): Seconds a fetched robots.txt stays valid. Default is 1 day.
+    user_agent (str): Agent name robots.txt rules are evaluated for. Default is '*'.
+    """
+
+    def __init__(self, rate=1.0, burst=2, robots=True, robots_ttl=24 * 3600, user_agent='*'):
+        self.rate = rate
+        self.burst = burst
+        self.robots = RobotsCache(user_agent, robots_ttl) if robots else None
+        self.host_scheduler = None
+
+    def scheduler(self, session=None):
+        """
+        Build the host scheduler the crawl's workers take their URLs from. With
+        a session, each host's robots.txt is read before its first URL goes out.
+        """
+        prepare = None
+        if self.robots is not None and session is not None:
+            async def prepare(url):
+                await self.allowed(session, url)
+        self.host_scheduler = HostScheduler(self.rate, self.burst, prepare)
+        return self.host_scheduler
+
+    async def allowed(self, session, url):
+        """
+        Whether robots.txt lets us fetch url, applying its Crawl-delay to the host.
+        """
+        if self.robots is None:
+            return True
+        parser = await self.robots.get(session, url)
+        delay = parser.crawl_delay(self.robots.user_agent)
+        if delay and self.host_scheduler is not None:
+            self.host_scheduler.set_crawl_delay(host_of(url), delay)
+        return parser.can_fetch(self.robots.user_agent, url)
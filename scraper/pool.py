@@ -0,0 +1,82 @@
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from .extract import FIELDS, extract_info
+from .metrics import timed_extract
+
+"""
+    Multiprocess extraction. Parsing and the extractors are pure-Python CPU
+    work bound by the GIL, so the fetch engine hands raw page bytes to a pool
+    of worker processes and gets compact records back. A bounded number of
+    pages may wait for extraction at a time; when the pool falls behind,
+    fetch workers block before submitting, which throttles downloading too.
+"""
+
+
+def _extract_compact(extract, url, content, fields, timed, detail, encoding):
+    # Runs in the worker process: return a tuple instead of a dict to keep the reply small
+    if timed:
+        info, timings = timed_extract(extract, url, content, fields, detail, encoding)
+    else:
+        info, timings = extract(url, content, fields, encoding=encoding), None
+    return tuple(info.get(field) for field in FIELDS), timings
+
+
+class ExtractPool:
+    """
+    Process pool running extract functions on raw page bytes.
+
+    Parameters:
+    processes (int): Worker processes. Default is the number of CPU cores.
+    max_pending (int): Pages submitted but not yet extracted before fetching
+        has to wait. Default is twice the number of processes.
+    extract (callable): Picklable function turning (url, content, fields, encoding=None) into a result dict.
+    """
+
+    def __init__(self, processes=None, max_pending=None, extract=extract_info):
+        self.processes = processes or os.cpu_count() or 1
+        self.max_pending = max_pending or 2 * self.processes
+        self.extract = extract
+        self.executor = ProcessPoolExecutor(self.processes)
+        self.slots = None
+        self.loop = None
+
+    async def run(self, url, content, fields, sample=None, detail=False, encoding=None):
+        """
+        Extract one page in a worker process, waiting for a free slot first.
+        With a Sample the time spent in the worker is added to it, broken down
+        into parsing and fields if detail (see scraper.metrics.timed_extract).
+        encoding is the charset from the HTTP headers, if any.
+
+        Returns:
+        dict: The result dictionary, holding only the requested fields.
+        """
+        loop = asyncio.get_running_loop()
+        if self.slots is None or self.loop is not loop:
+            # Created per event loop, a semaphore cannot be shared between loops
+            self.slots = asyncio.Semaphore(self.max_pending)
+            self.loop = loop
+        async with self.slots:
+            values, timings = await loop.run_in_executor(
+                self.executor, _extract_compact, self.extract, url, content, fields, sample is not None, detail,
+                encoding)
+        if timings is not None:
+            for stage, seconds in timings.items():
+                sample.add(stage, seconds)
+        info = {'URL': url}
+        for field, value in zip(FIELDS, values):
+            if field in fields:
+                info[field] = value
+        return info
+
+    def close(self):
+        self.executor.shutdown()
+        self.slots = None
+        self.loop = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
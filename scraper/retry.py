@@ -0,0 +1,121 @@
+import asyncio
+import json
+import random
+import socket
+import time
+
+import aiohttp
+
+"""
+    Retry handling. Failures are classified as transient (timeouts, dropped
+    connections, 408/425/429 and 5xx responses) or permanent (DNS names that do
+    not exist, TLS certificate and handshake errors, other 4xx responses,
+    robots.txt refusals). Transient failures are re-enqueued after an
+    exponential backoff with full jitter instead of sleeping in the worker,
+    and permanent ones go to a dead-letter file that can be replayed later.
+"""
+
+
+# HTTP statuses worth trying again
+TRANSIENT_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+
+
+class PermanentError(Exception):
+    """
+    A failure that retrying cannot fix, e.g. a URL disallowed by robots.txt.
+    """
+
+
+def classify(error):
+    """
+    Decide whether a failed attempt is worth retrying.
+
+    Parameters:
+    error (Exception): What the attempt raised.
+
+    Returns:
+    tuple: (transient (bool), short reason string).
+    """
+    if isinstance(error, PermanentError):
+        return False, str(error)
+    if isinstance(error, asyncio.TimeoutError):
+        return True, 'timeout'
+    if isinstance(error, aiohttp.ClientResponseError):
+        return error.status in TRANSIENT_STATUSES, f'HTTP {error.status}'
+    if isinstance(error, aiohttp.ClientSSLError):
+        # Certificate and handshake failures are ClientConnectorErrors too, but retrying will not fix them.
+        # Older aiohttp leaves os_error unset on certificate errors, so it is not read here
+        return False, f"SSL: {getattr(error, 'certificate_error', None) or error}"
+    if isinstance(error, aiohttp.ClientConnectorError):
+        os_error = error.os_error
+        if isinstance(os_error, socket.gaierror):
+            # EAI_AGAIN is a resolver hiccup, anything else means the name does not resolve
+            return os_error.errno == socket.EAI_AGAIN, f'DNS: {os_error.strerror}'
+        return True, f'connect: {os_error.strerror or os_error}'
+    if isinstance(error, (aiohttp.ServerDisconnectedError, aiohttp.ClientPayloadError,
+                          aiohttp.ClientOSError)):
+        return True, type(error).__name__
+    if isinstance(error, (aiohttp.TooManyRedirects, aiohttp.InvalidURL)):
+        return False, type(error).__name__
+    if isinstance(error, aiohttp.ClientError):
+        return True, type(error).__name__
+    return False, f'{type(error).__name__}: {error}'
+
+
+class RetryPolicy:
+    """
+    How often and how long to wait before trying a transiently failed URL again.
+
+    Parameters:
+    attempts (int): Total attempts per URL, the first one included. Default is 3.
+    base (float): Backoff ceiling in seconds after the first failure, doubled after each. Default is 1.
+    cap (float): Largest backoff ceiling in seconds. Default is 60.
+    """
+
+    def __init__(self, attempts=3, base=1.0, cap=60.0):
+        self.attempts = attempts
+        self.base = base
+        self.cap = cap
+
+    def backoff(self, attempt, error=None):
+        """
+        Seconds to wait before attempt number attempt + 1 (attempt counts from 0).
+        """
+        # Full jitter spreads retries of URLs that failed together
+        delay = random.uniform(0, min(self.cap, self.base * 2 ** attempt))
+        headers = getattr(error, 'headers', None)
+        retry_after = headers.get('Retry-After') if headers else None
+        if retry_after and retry_after.strip().isdigit():
+            delay = max(delay, min(self.cap, float(retry_after)))
+        return delay
+
+
+class DeadLetter:
+    """
+    JSON lines file of permanently failed URLs with the reason, for later replay.
+
+    Parameters:
+    path (str): File the failures are appended to.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.count = 0
+
+    def write(self, url, reason, attempts):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps({
+                'url': url,
+                'reason': reason,
+                'attempts': attempts,
+                'failed_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+            }) + '\n')
+        self.count += 1
+
+    @staticmethod
+    def urls(path):
+        """
+        The URLs recorded in a dead-letter file, to feed back into a crawl.
+        """
+        with open(path, encoding='utf-8') as f:
+            return [json.loads(line)['url'] for line in f if line.strip()]
@@ -0,0 +1,455 @@
+import json
+import os
+import re
+from urllib.parse import urlsplit
+
+"""
+    Declarative detection tables. Each table is compiled once at import, the
+    tech stack into a single matcher over a page's asset URLs and the payment
+    gateways into a keyword index tested against the page lowercased once.
+    With the optional pyahocorasick package the gateway keywords are found in
+    one pass over the page; without it each of the ~40 keywords is a separate
+    substring scan of the lowercased page.
+"""
+
+
+# Tech stack signatures: (technology, asset kind, substrings found in the asset URL)
+# Asset kind is 'script' for <script src>, 'link' for <link href> and 'any' for both.
+TECH_SIGNATURES = [
+    # Frontend frameworks/libraries
+    ('React.js', 'script', ['react']),
+    ('Angular', 'script', ['angular']),
+    ('Vue.js', 'script', ['vue']),
+    ('jQuery', 'script', ['jquery']),
+    ('Backbone.js', 'script', ['backbone']),
+    ('Ember.js', 'script', ['ember']),
+    ('Svelte', 'script', ['svelte']),
+    ('Polymer', 'script', ['polymer']),
+    ('Alpine.js', 'script', ['alpine']),
+    ('Stimulus.js', 'script', ['stimulus']),
+    ('Riot.js', 'script', ['riot']),
+
+    # CSS frameworks/preprocessors
+    ('Bootstrap', 'link', ['bootstrap']),
+    ('Foundation', 'link', ['foundation']),
+    ('Materialize CSS', 'link', ['materialize']),
+    ('Bulma', 'link', ['bulma']),
+    ('Tailwind CSS', 'link', ['tailwind']),
+    ('Sass', 'link', ['sass', 'scss']),
+    ('Less', 'link', ['.less']),
+    ('Stylus', 'link', ['stylus']),
+
+    # CMS platforms, recognised by the asset paths they serve
+    ('WordPress (CMS)', 'any', ['wp-content/', 'wp-includes/']),
+    ('Drupal (CMS)', 'any', ['/sites/default/files/', 'drupal']),
+    ('Joomla (CMS)', 'any', ['/media/jui/', 'joomla']),
+]
+
+
+def compile_signatures(signatures):
+    """
+    Compile a signature table into one alternation regex per asset kind.
+
+    Parameters:
+    signatures (list): (technology, kind, substrings) tuples like TECH_SIGNATURES.
+
+    Returns:
+    dict: Asset kind -> (compiled regex, {group name: technology}).
+    """
+    compiled = {}
+    for kind in ('script', 'link'):
+        alternatives = []
+        names = {}
+        for i, (technology, asset_kind, patterns) in enumerate(signatures):
+            if asset_kind not in (kind, 'any'):
+                continue
+            group = f't{i}'
+            names[group] = technology
+            # Longest first so a pattern never hides a longer one starting at the same place
+            body = '|'.join(re.escape(p) for p in sorted(patterns, key=len, reverse=True))
+            alternatives.append(f'(?P<{group}>{body})')
+        compiled[kind] = (re.compile('|'.join(alternatives), re.IGNORECASE), names)
+    return compiled
+
+
+TECH_MATCHERS = compile_signatures(TECH_SIGNATURES)
+
+
+def detect_tech_stack(script_srcs, link_hrefs):
+    """
+    Classify every script and stylesheet URL of a page in one pass per asset kind.
+
+    Parameters:
+    script_srcs (iterable): The src attributes of the page's <script> tags.
+    link_hrefs (iterable): The href attributes of the page's <link> tags.
+
+    Returns:
+    list: Detected technologies, each once, in order of first appearance.
+    """
+    found = {}
+    for kind, assets in (('script', script_srcs), ('link', link_hrefs)):
+        pattern, names = TECH_MATCHERS[kind]
+        # Newline separated so a match can never span two asset URLs
+        for match in pattern.finditer('\n'.join(assets)):
+            found.setdefault(names[match.lastgroup], None)
+    return list(found)
+
+
+# Payment gateway signatures: (gateway, keywords searched case-insensitively in the raw page)
+GATEWAY_SIGNATURES = [
+    # Global Payment Gateways
+    ('PayPal', ['paypal']),
+    ('Stripe', ['stripe']),
+    ('Square', ['square']),
+    ('Authorize.Net', ['authorize.net']),
+    ('2Checkout (Verifone)', ['2checkout', 'verifone']),
+    ('Braintree', ['braintree']),
+    ('Amazon Pay', ['amazon pay']),
+    ('Google Pay', ['google pay']),
+    ('Apple Pay', ['apple pay']),
+
+    # Regional Payment Gateways
+    ('Razorpay', ['razorpay']),
+    ('PayU', ['payu']),
+    ('Paytm', ['paytm']),
+    ('PhonePe', ['phonepe']),
+    ('CCAvenue', ['ccavenue']),
+    ('Instamojo', ['instamojo']),
+    ('Mollie', ['mollie']),
+    ('Klarna', ['klarna']),
+    ('Adyen', ['adyen']),
+    ('Alipay', ['alipay']),
+    ('WeChat Pay', ['wechat pay']),
+    ('BlueSnap', ['bluesnap']),
+    ('Worldpay', ['worldpay']),
+    ('Payoneer', ['payoneer']),
+    ('BitPay', ['bitpay']),
+    ('Skrill', ['skrill']),
+    ('Neteller', ['neteller']),
+
+    # Additional Payment Gateways
+    ('Dwolla', ['dwolla']),
+    ('Venmo', ['venmo']),
+    ('Sezzle', ['sezzle']),
+    ('Afterpay', ['afterpay']),
+    ('Zelle', ['zelle']),
+    ('Payline', ['payline']),
+    ('Verifone', ['verifone']),
+    ('Eway', ['eway']),
+    ('GoCardless', ['gocardless']),
+    ('Payza', ['payza']),
+    ('Paysera', ['paysera']),
+    ('Paymill', ['paymill']),
+]
+
+
+def compile_keywords(signatures):
+    """
+    Index a (name, keywords) table by keyword. When pyahocorasick is installed
+    the keywords are also built into an Aho-Corasick automaton.
+
+    Returns:
+    tuple: ({lowercase keyword: [names it reveals]}, automaton or None).
+    """
+    owners = {}
+    for name, keywords in signatures:
+        for keyword in keywords:
+            owners.setdefault(keyword.lower().encode(), []).append(name)
+    try:
+        import ahocorasick
+    except ImportError:
+        return owners, None
+    automaton = ahocorasick.Automaton()
+    for keyword in owners:
+        automaton.add_word(keyword.decode('latin-1'), keyword)
+    automaton.make_automaton()
+    return owners, automaton
+
+
+GATEWAY_OWNERS, GATEWAY_AUTOMATON = compile_keywords(GATEWAY_SIGNATURES)
+GATEWAY_ORDER = {name: i for i, (name, _) in enumerate(GATEWAY_SIGNATURES)}
+
+
+def detect_payment_gateways(content):
+    """
+    Find every payment gateway mentioned in a page. The body is lowercased
+    once, then searched in one automaton pass with pyahocorasick, or else
+    with one substring scan per keyword.
+
+    Parameters:
+    content (bytes): The raw response body.
+
+    Returns:
+    list: Detected gateways in table order.
+    """
+    body = content.lower()
+    if GATEWAY_AUTOMATON is not None:
+        seen = {keyword for _, keyword in GATEWAY_AUTOMATON.iter(body.decode('latin-1'))}
+    else:
+        seen = [keyword for keyword in GATEWAY_OWNERS if keyword in body]
+    found = {name for keyword in seen for name in GATEWAY_OWNERS[keyword]}
+    return sorted(found, key=GATEWAY_ORDER.get)
+
+
+# Social media platforms and their registered domains, subdomains match too
+SOCIAL_MEDIA_PLATFORMS = {
+    'Facebook': ['facebook.com', 'fb.com'],
+    'Twitter': ['twitter.com', 'x.com'],
+    'Instagram': ['instagram.com'],
+    'LinkedIn': ['linkedin.com'],
+    'YouTube': ['youtube.com', 'youtu.be'],
+    'Pinterest': ['pinterest.com'],
+    'TikTok': ['tiktok.com'],
+    'Snapchat': ['snapchat.com'],
+    'Reddit': ['reddit.com'],
+    'Tumblr': ['tumblr.com'],
+    'WhatsApp': ['whatsapp.com', 'wa.me'],
+    'WeChat': ['wechat.com'],
+    'Telegram': ['telegram.org', 't.me'],
+    'Discord': ['discord.com', 'discord.gg'],
+    'Clubhouse': ['joinclubhouse.com'],
+    'Quora': ['quora.com'],
+    'Medium': ['medium.com'],
+    'Flickr': ['flickr.com'],
+    'Vimeo': ['vimeo.com'],
+    'Twitch': ['twitch.tv'],
+    'Vine': ['vine.co'],
+    'Myspace': ['myspace.com'],
+    'VKontakte (VK)': ['vk.com'],
+    'Sina Weibo': ['weibo.com'],
+    'XING': ['xing.com'],
+    'Yubo': ['yubo.live'],
+    'Meetup': ['meetup.com'],
+    'Nextdoor': ['nextdoor.com'],
+    'Gab': ['gab.com'],
+    'Parler': ['parler.com'],
+}
+
+# Environment variable naming a JSON file {platform: [domains]} merged into the table at import
+SOCIAL_CONFIG_ENV = 'SCRAPER_SOCIAL_PLATFORMS'
+
+# domain -> platform, one dict lookup per hostname suffix
+SOCIAL_DOMAIN_INDEX = {}
+
+
+def register_social_platforms(platforms):
+    """
+    Add platforms to the social link index.
+
+    Parameters:
+    platforms (dict): Platform name -> list of domains, like SOCIAL_MEDIA_PLATFORMS.
+    """
+    for platform, domains in platforms.items():
+        for domain in domains:
+            SOCIAL_DOMAIN_INDEX[domain.lower().removeprefix('www.')] = platform
+
+
+def load_social_platforms(path):
+    """
+    Add the platforms of a JSON config file {platform: [domains]} to the index.
+    """
+    with open(path, encoding='utf-8') as f:
+        register_social_platforms(json.load(f))
+
+
+register_social_platforms(SOCIAL_MEDIA_PLATFORMS)
+if os.environ.get(SOCIAL_CONFIG_ENV):
+    load_social_platforms(os.environ[SOCIAL_CONFIG_ENV])
+
+
+def social_platform(href):
+    """
+    Classify a link by its hostname.
+
+    Parameters:
+    href (str): The href of an <a> tag.
+
+    Returns:
+    str: The platform the link points to, or None.
+    """
+    try:
+        host = urlsplit(href).hostname
+    except ValueError:
+        return None
+    if not host:
+        # Relative links never point to another site
+        return None
+    # m.facebook.com -> facebook.com -> com, a handful of lookups at most
+    while True:
+        platform = SOCIAL_DOMAIN_INDEX.get(host)
+        if platform is not None:
+            return platform
+        dot = host.find('.')
+        if dot < 0:
+            return None
+        host = host[dot + 1:]
+
+
+# Categories and the keywords that reveal them. Keywords match whole words,
+# case-insensitively unless written in capitals ('IT' must not match "it").
+CATEGORIES = {
+    'E-commerce': ['shop', 'store', 'product', 'ecommerce', 'shopping', 'buy', 'sell', 'retail', 'marketplace', 
+                'online shop', 'storefront', 'online store', 'shopping cart', 'checkout', 
+                'e-commerce platform', 'online marketplace', 'digital storefront', 'buy online'],
+    'News and Media': ['news', 'magazine', 'blog', 'press', 'journal', 'newspaper', 'media', 'editorial', 
+                    'headline', 'current events', 'journalism', 'publication', 'breaking news', 
+                    'media outlet', 'online magazine', 'news updates', 'news commentary'],
+    'Corporate': ['business', 'corporate', 'company', 'enterprise', 'organization', 
+                'business solutions', 'business services', 'global business', 'industry', 
+                'corporate website', 'business development', 'company profile', 'enterprise solutions'],
+    'Technology': ['saas', 'tech', 'software', 'hardware', 'technology', 'digital', 'IT', 'innovation', 
+                'internet', 'software development', 'tech news', 'digital transformation', 'cloud computing', 
+                'tech solutions', 'digital services', 'IT infrastructure', 'tech support'],
+    'Educational': ['course', 'learning', 'university', 'education', 'study', 'classroom', 'academic', 
+                    'online courses', 'distance learning', 'educational resources', 'academic programs', 
+                    'educational platform', 'learning management system', 'online education', 'academic institution'],
+    'Non-Profit and Government': ['nonprofit', 'ngo', 'government', 'charity', 'foundation', 'public sector', 
+                                'social services', 'community support', 'public policy', 'humanitarian', 
+                                'government agency', 'nonprofit organization', 'social impact', 'charitable foundation'],
+    'Entertainment': ['entertainment', 'gaming', 'music', 'movie', 'film', 'video', 'celebrity', 
+                    'entertainment news', 'pop culture', 'streaming', 'celebrity news', 'film reviews', 
+                    'entertainment industry', 'music streaming', 'movie reviews', 'gaming community'],
+    'Health and Fitness': ['health', 'fitness', 'medical', 'wellness', 'nutrition', 'exercise', 'healthcare', 
+                        'healthy living', 'medical advice', 'fitness tips', 'nutrition guide', 'mental health', 
+                        'health services', 'wellness programs', 'medical treatments', 'nutrition counseling'],
+    'Travel and Hospitality': ['travel', 'hotel', 'booking', 'vacation', 'tourism', 'resort', 'destination', 
+                            'travel guide', 'hotel booking', 'vacation rentals', 'tourist attractions', 
+                            'hospitality industry', 'travel agency', 'resort accommodations', 'tourism services'],
+    'Food and Beverage': ['restaurant', 'recipe', 'food', 'eatery', 'cooking', 'cuisine', 'beverage', 
+                        'recipes', 'culinary', 'foodie', 'dining', 'food reviews', 
+                        'restaurant reviews', 'culinary experiences', 'food delivery', 'beverage services'],
+    'Real Estate': ['realestate', 'property', 'realty', 'housing', 'apartment', 'home', 'estate', 
+                    'real estate listings', 'property management', 'housing market', 'real estate services', 
+                    'property investments', 'housing rentals', 'real estate agents', 'commercial property'],
+    'Personal': ['personal', 'portfolio', 'resume', 'cv', 'profile', 'bio', 'personal website', 
+                'online portfolio', 'personal branding', 'resume builder', 'professional profile', 
+                'personal blog', 'digital resume', 'career portfolio', 'online identity'],
+    'Community and Forums': ['community', 'forum', 'social', 'network', 'discussion', 'group', 'community site', 
+                            'online community', 'discussion forum', 'social network', 'community platform', 
+                            'forum discussion', 'social engagement', 'community networking', 'group interactions'],
+    'Financial Services': ['bank', 'insurance', 'investment', 'finance', 'financial', 'money', 'wealth', 
+                        'financial planning', 'banking services', 'investment management', 'insurance coverage', 
+                        'financial advice', 'wealth management', 'investment banking', 'insurance solutions'],
+    'Legal Services': ['law', 'legal', 'attorney', 'lawyer', 'legal services', 'legal advice', 
+                    'law firm', 'legal counsel', 'legal representation', 'court cases', 
+                    'legal assistance', 'legal counsel', 'litigation services', 'legal solutions'],
+    'Fashion and Beauty': ['fashion', 'beauty', 'style', 'cosmetics', 'makeup', 'clothing', 'fashionista', 
+                        'fashion trends', 'beauty tips', 'style guides', 'cosmetic products', 
+                        'fashion industry', 'beauty industry', 'style advice', 'cosmetic enhancements'],
+    'Automotive': ['car', 'automotive', 'vehicle', 'truck', 'auto', 'motorcycle', 'car dealer', 
+                'automobile', 'vehicle sales', 'car reviews', 'auto repair', 
+                'automotive industry', 'vehicle services', 'auto parts', 'vehicle maintenance'],
+    'Others': ['classifieds', 'jobs', 'event', 'listing', 'classified', 'career', 'event management', 
+            'classified ads', 'job search', 'job listings', 'event planning', 
+            'community events', 'job opportunities', 'event coordination', 'classified listings']
+}
+
+
+# How much a keyword hit counts depending on where it was found
+CATEGORY_SOURCE_WEIGHTS = {'url': 3, 'title': 3, 'description': 2, 'text': 1}
+
+# Hits of one keyword in the visible text counted at most, so a word repeated
+# in every menu item cannot outvote the title
+CATEGORY_TEXT_CAP = 3
+
+# Score a category needs to beat 'Other', i.e. one hit in the URL or title
+CATEGORY_MIN_SCORE = 3
+
+# Words glued together in hostnames ('myshop.com') are found by substring,
+# too short keywords would match inside unrelated words
+URL_KEYWORD_MIN_LENGTH = 4
+
+WORD = re.compile(r'\w+')
+
+
+def compile_categories(categories):
+    """
+    Compile a {category: keywords} table into a phrase index over word tuples.
+
+    Returns:
+    tuple: ({lowercase word tuple: (weight, [categories], exact spelling or None)},
+        {first word: longest phrase starting with it}, regex finding the keywords inside URLs).
+    """
+    index = {}
+    starts = {}
+    url_keywords = set()
+    for category, keywords in categories.items():
+        for keyword in keywords:
+            words = WORD.findall(keyword)
+            key = tuple(word.lower() for word in words)
+            # Multi-word phrases are more specific than single words
+            exact = tuple(words) if keyword.isupper() else None
+            weight, names, _ = index.setdefault(key, (len(words), [], exact))
+            if category not in names:
+                names.append(category)
+            starts[key[0]] = max(starts.get(key[0], 0), len(key))
+            if len(words) == 1 and len(keyword) >= URL_KEYWORD_MIN_LENGTH:
+                url_keywords.add(key[0])
+    body = '|'.join(re.escape(k) for k in sorted(url_keywords, key=len, reverse=True))
+    return index, starts, re.compile(body)
+
+
+CATEGORY_INDEX, CATEGORY_STARTS, CATEGORY_URL_PATTERN = compile_categories(CATEGORIES)
+CATEGORY_ORDER = {name: i for i, name in enumerate(CATEGORIES)}
+
+
+def _phrase_hits(text):
+    """
+    Count keyword phrases in text, longest match first, on whole words only.
+    """
+    words = WORD.findall(text)
+    lowered = [word.lower() for word in words]
+    hits = {}
+    i = 0
+    while i < len(words):
+        # Most words start no keyword at all, one dict lookup rules them out
+        longest = CATEGORY_STARTS.get(lowered[i])
+        if longest is None:
+            i += 1
+            continue
+        for n in range(min(longest, len(words) - i), 0, -1):
+            key = tuple(lowered[i:i + n])
+            entry = CATEGORY_INDEX.get(key)
+            if entry is not None and (entry[2] is None or entry[2] == tuple(words[i:i + n])):
+                hits[key] = hits.get(key, 0) + 1
+                i += n
+                break
+        else:
+            i += 1
+    return hits
+
+
+def classify_category(url, title=None, description=None, text=None):
+    """
+    Score every category by weighted keyword hits and return the best one.
+
+    Parameters:
+    url (str): The URL of the page.
+    title (str): The page title. Default is None.
+    description (str): The meta description. Default is None.
+    text (str): Visible text of the page. Default is None.
+
+    Returns:
+    str: The best scoring category, ties going to table order, or 'Other'.
+    """
+    url_hits = {}
+    for keyword in CATEGORY_URL_PATTERN.findall(url.lower()):
+        url_hits[(keyword,)] = 1
+    sources = [('url', url_hits)]
+    for source, value in (('title', title), ('description', description), ('text', text)):
+        if value:
+            sources.append((source, _phrase_hits(value)))
+
+    scores = {}
+    for source, hits in sources:
+        factor = CATEGORY_SOURCE_WEIGHTS[source]
+        for key, count in hits.items():
+            if source == 'text':
+                count = min(count, CATEGORY_TEXT_CAP)
+            weight, names, _ = CATEGORY_INDEX[key]
+            for name in names:
+                scores[name] = scores.get(name, 0) + factor * weight * count
+    if not scores:
+        return 'Other'
+    best = min(scores, key=lambda name: (-scores[name], CATEGORY_ORDER[name]))
+    return best if scores[best] >= CATEGORY_MIN_SCORE else 'Other'
@@ -0,0 +1,314 @@
+import csv
+import glob
+import io
+import json
+import os
+import time
+
+from .extract import FIELDS
+from .output import normalise, schema_for
+
+"""
+    Streaming result sinks. Results are appended to CSV, JSON lines or a
+    directory of Parquet parts in batches while the crawl runs, so memory
+    stays flat however many pages are scraped. Every batch ends with an
+    fsync and a checkpoint; a crawl that crashed reopens its sink with
+    resume=True, which drops whatever was written after the last checkpoint
+    and lists the URLs that already have results so they are not fetched again.
+    Several outputs of one crawl go through a SinkGroup, which checkpoints
+    them together so they always hold the same URLs.
+"""
+
+
+def _fsync_replace(tmp, path):
+    with open(tmp, 'rb+') as f:
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+class Sink:
+    """
+    Base class of the sinks: buffers records and writes them batch by batch.
+
+    Parameters:
+    path (str): Where the results go.
+    fields (iterable): The fields the records hold. Default is all of them.
+    batch_size (int): Records buffered before a batch is written. Default is 1000.
+    interval (float): Seconds after which a partial batch is written anyway. Default is 30.
+    resume (bool): Keep the results of an earlier, interrupted run instead of starting over. Default is False.
+    """
+
+    def __init__(self, path, fields=None, batch_size=1000, interval=30, resume=False):
+        self.path = path
+        if fields is not None:
+            unknown = [field for field in fields if field not in FIELDS]
+            if unknown:
+                raise ValueError(f"Unknown fields {unknown}, expected names from {FIELDS}")
+        self.fields = FIELDS if fields is None else [field for field in FIELDS if field in fields]
+        self.columns = ['URL'] + self.fields
+        self.batch_size = batch_size
+        self.interval = interval
+        self.rows = []
+        self.written = 0
+        self.flushed_at = time.monotonic()
+
+    def write(self, record):
+        self.rows.append(record)
+        if len(self.rows) >= self.batch_size or time.monotonic() - self.flushed_at >= self.interval:
+            self.flush()
+
+    def write_many(self, records):
+        for record in records:
+            self.write(record)
+
+    def flush(self):
+        if self.rows:
+            self._write_batch(self.rows)
+            self.written += len(self.rows)
+            self.rows = []
+        self.flushed_at = time.monotonic()
+
+    def completed_urls(self):
+        """
+        Iterate over the URLs that already have a result, read back from disk.
+        """
+        raise NotImplementedError
+
+    def position(self):
+        """
+        How far the sink has written, as a JSON value that rollback() returns to.
+        """
+        raise NotImplementedError
+
+    def rollback(self, position):
+        """
+        Drop everything written after position, see position().
+        """
+        raise NotImplementedError
+
+    def _write_batch(self, rows):
+        raise NotImplementedError
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class _FileSink(Sink):
+    """
+    Sink appending to one text file. The byte offset after the last fsynced
+    batch is kept in <path>.checkpoint and the file is cut back to it on resume.
+    """
+
+    def __init__(self, path, fields=None, batch_size=1000, interval=30, resume=False):
+        super().__init__(path, fields, batch_size, interval, resume)
+        self.checkpoint_path = f'{path}.checkpoint'
+        offset = 0
+        if resume and os.path.exists(self.checkpoint_path):
+            with open(self.checkpoint_path, encoding='utf-8') as f:
+                offset = json.load(f)['offset']
+        self.file = open(path, 'a+b')
+        # Anything past the checkpoint is a batch that was cut short by the crash
+        self.file.truncate(offset)
+        self.file.seek(offset)
+        if offset == 0:
+            self._start()
+
+    def _start(self):
+        pass
+
+    def position(self):
+        return self.file.tell()
+
+    def rollback(self, position):
+        self.file.truncate(position)
+        self.file.seek(position)
+        if position == 0:
+            self._start()
+        self._checkpoint()
+
+    def _checkpoint(self):
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        tmp = f'{self.checkpoint_path}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'offset': self.file.tell(), 'saved_at': time.strftime('%Y-%m-%d %H:%M:%S')}, f)
+        _fsync_replace(tmp, self.checkpoint_path)
+
+    def close(self):
+        super().close()
+        self._checkpoint()
+        self.file.close()
+
+
+class CSVSink(_FileSink):
+    """
+    Append results to a CSV file in the layout of the scraper's CSV output. See Sink for the parameters.
+    """
+
+    def _start(self):
+        self._write_rows([self.columns])
+
+    def _write_rows(self, rows):
+        text = io.StringIO()
+        csv.writer(text).writerows(rows)
+        self.file.write(text.getvalue().encode('utf-8'))
+        self._checkpoint()
+
+    def _write_batch(self, rows):
+        # Same text as DataFrame.to_csv: dicts written with str(), missing values empty
+        self._write_rows([['' if row.get(name) is None else str(row.get(name)) for name in self.columns]
+                          for row in rows])
+
+    def completed_urls(self):
+        if self.rows:
+            self.flush()
+        with open(self.path, newline='', encoding='utf-8') as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if header is None:
+                return
+            column = header.index('URL')
+            for row in reader:
+                yield row[column]
+
+
+class JSONLSink(_FileSink):
+    """
+    Append results as JSON lines, one object per page. See Sink for the parameters.
+    """
+
+    def _write_batch(self, rows):
+        text = ''.join(json.dumps({name: row.get(name) for name in self.columns}) + '\n' for row in rows)
+        self.file.write(text.encode('utf-8'))
+        self._checkpoint()
+
+    def completed_urls(self):
+        if self.rows:
+            self.flush()
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)['URL']
+
+
+class ParquetSink(Sink):
+    """
+    Write results as a directory of Parquet files, one part per batch, readable
+    as a single table with pandas.read_parquet or pyarrow. Each part is fsynced
+    under a temporary name and renamed into place, so a part is either complete
+    or absent. See Sink for the parameters.
+    """
+
+    def __init__(self, path, fields=None, batch_size=1000, interval=30, resume=False):
+        super().__init__(path, fields, batch_size, interval, resume)
+        self.schema = schema_for(self.fields)
+        if os.path.isfile(path) and not resume:
+            # A single Parquet file from an older run, replaced like any other output
+            os.remove(path)
+        os.makedirs(path, exist_ok=True)
+        for name in glob.glob(os.path.join(path, '*.tmp')) + ([] if resume else self._parts()):
+            os.remove(name)
+        self.part = len(self._parts())
+
+    def _parts(self):
+        return sorted(glob.glob(os.path.join(self.path, 'part-*.parquet')))
+
+    def position(self):
+        return self.part
+
+    def rollback(self, position):
+        for name in self._parts()[position:]:
+            os.remove(name)
+        self.part = position
+
+    def _write_batch(self, rows):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        rows = [normalise(row) for row in rows]
+        columns = {name: [row.get(name) for row in rows] for name in self.schema.names}
+        path = os.path.join(self.path, f'part-{self.part:05d}.parquet')
+        tmp = f'{path}.tmp'
+        pq.write_table(pa.Table.from_pydict(columns, schema=self.schema), tmp)
+        _fsync_replace(tmp, path)
+        self.part += 1
+
+    def completed_urls(self):
+        import pyarrow.parquet as pq
+
+        if self.rows:
+            self.flush()
+        for part in self._parts():
+            yield from pq.read_table(part, columns=['URL']).column('URL').to_pylist()
+
+
+class SinkGroup(Sink):
+    """
+    Several outputs of the same results, e.g. CSV and Parquet, written in step.
+    Each batch goes to every sink before one shared checkpoint records how far
+    they all got, and resume rolls every sink back to it, so a crash between
+    two sinks' writes cannot leave them holding different URLs.
+
+    Parameters:
+    paths (list): One output per path, see open_sink. The checkpoint is kept
+        next to the first as <path>.group.checkpoint.
+    Other parameters as for Sink.
+    """
+
+    def __init__(self, paths, fields=None, batch_size=1000, interval=30, resume=False):
+        super().__init__(paths[0], fields, batch_size, interval, resume)
+        self.sinks = [open_sink(path, fields, batch_size, interval, resume) for path in paths]
+        self.checkpoint_path = f'{paths[0]}.group.checkpoint'
+        if resume and os.path.exists(self.checkpoint_path):
+            with open(self.checkpoint_path, encoding='utf-8') as f:
+                positions = json.load(f)['positions']
+            for sink in self.sinks:
+                if sink.path in positions:
+                    sink.rollback(positions[sink.path])
+        self._checkpoint()
+
+    def _write_batch(self, rows):
+        for sink in self.sinks:
+            sink._write_batch(rows)
+            sink.written += len(rows)
+        self._checkpoint()
+
+    def _checkpoint(self):
+        tmp = f'{self.checkpoint_path}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'positions': {sink.path: sink.position() for sink in self.sinks},
+                       'saved_at': time.strftime('%Y-%m-%d %H:%M:%S')}, f)
+        _fsync_replace(tmp, self.checkpoint_path)
+
+    def completed_urls(self):
+        if self.rows:
+            self.flush()
+        return self.sinks[0].completed_urls()
+
+    def close(self):
+        super().close()
+        for sink in self.sinks:
+            sink.close()
+
+
+# Sink class per file extension
+SINKS = {'.csv': CSVSink, '.jsonl': JSONLSink, '.parquet': ParquetSink}
+
+
+def open_sink(path, fields=None, batch_size=1000, interval=30, resume=False):
+    """
+    Open the sink matching the extension of path (.csv, .jsonl or .parquet),
+    or a SinkGroup for a list of paths. See Sink for the parameters.
+    """
+    if isinstance(path, (list, tuple)):
+        return SinkGroup(list(path), fields, batch_size, interval, resume)
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in SINKS:
+        raise ValueError(f"Unsupported output {path!r}, expected one of {', '.join(SINKS)}")
+    return SINKS[extension](path, fields, batch_size, interval, resume)
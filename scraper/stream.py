@@ -0,0 +1,63 @@
+import codecs
+from html.parser import HTMLParser
+
+"""
+    Incremental watcher for streamed downloads. Response chunks are fed in as
+    they arrive and the watcher reports when every requested field can already
+    be extracted, so the rest of a heavy page never has to be downloaded.
+"""
+
+
+# Fields that are final once the parser has left <head>
+HEAD_FIELDS = {'Meta Title', 'Meta Description', 'Language'}
+
+
+class HeadWatcher(HTMLParser):
+    """
+    HTML parser fed chunk by chunk that tracks which head fields are resolved.
+
+    Parameters:
+    fields (iterable): The fields the caller asked for.
+    encoding (str): Charset used to decode the chunks. Default is utf-8.
+    """
+
+    def __init__(self, fields, encoding='utf-8'):
+        super().__init__(convert_charrefs=True)
+        self.pending = set(fields)
+        try:
+            self.decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+        except LookupError:
+            self.decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+
+    @property
+    def done(self):
+        return not self.pending
+
+    def feed_bytes(self, chunk):
+        """
+        Feed one raw chunk and return True once every requested field is resolved.
+        """
+        if self.pending:
+            self.feed(self.decoder.decode(chunk))
+        return self.done
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'html':
+            self.pending.discard('Language')
+        elif tag == 'meta' and dict(attrs).get('name') == 'description':
+            self.pending.discard('Meta Description')
+        elif tag == 'body':
+            self.pending -= HEAD_FIELDS
+
+    def handle_endtag(self, tag):
+        if tag == 'title':
+            self.pending.discard('Meta Title')
+        elif tag == 'head':
+            self.pending -= HEAD_FIELDS
+
+
+def can_stop_early(fields):
+    """
+    Whether a download may end before the body once the given fields are resolved.
+    """
+    return set(fields) <= HEAD_FIELDS
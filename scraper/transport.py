@@ -0,0 +1,148 @@
+import ssl
+import time
+
+import aiohttp
+
+from .extract import HEADERS
+
+"""
+    Shared HTTP transport of a crawl. One aiohttp connector keeps a TTL-bounded
+    DNS cache and pooled keep-alive connections per host, and one SSL context
+    is shared by every TLS connection. Trace hooks record where the time of
+    each request goes (DNS, connect, waiting for headers, body transfer) so the
+    savings of connection reuse can be measured across a crawl.
+"""
+
+
+def _note(ctx, stage, seconds):
+    # Per-URL timings, when the request was made with trace_request_ctx=Sample
+    sample = ctx.trace_request_ctx
+    if sample is not None:
+        sample.add(stage, seconds)
+
+
+class TransportStats:
+    """
+    Aggregated connection and timing counters of a crawl.
+    """
+
+    def __init__(self):
+        self.requests = 0
+        self.new_connections = 0
+        self.reused_connections = 0
+        self.dns_cache_hits = 0
+        self.dns_lookups = 0
+        self.dns_time = 0.0
+        self.connect_time = 0.0
+        self.wait_time = 0.0
+        self.transfer_time = 0.0
+        self.bytes = 0
+
+    def add_transfer(self, seconds, size):
+        self.transfer_time += seconds
+        self.bytes += size
+
+    def as_dict(self):
+        return dict(vars(self))
+
+    def report(self):
+        """
+        One line summary for the end of a run.
+        """
+        return (f"Transport: {self.requests} requests, {self.new_connections} new / "
+                f"{self.reused_connections} reused connections, DNS {self.dns_lookups} lookups / "
+                f"{self.dns_cache_hits} cached ({self.dns_time:.2f}s), connect {self.connect_time:.2f}s, "
+                f"waiting {self.wait_time:.2f}s, transfer {self.transfer_time:.2f}s "
+                f"({self.bytes / 1024:.0f} KB)")
+
+
+class Transport:
+    """
+    Connection pool, DNS cache and TLS context shared by every request of a crawl.
+
+    The pool and DNS cache belong to the event loop of one crawl: every
+    session() call, so every crawl() or scrape_many() call, opens a fresh
+    connector. Passing the same Transport to several crawls only shares the
+    TLS context and the stats. To reuse connections, crawl the URLs together.
+
+    Parameters:
+    limit (int): Maximum number of open connections overall. Default is 50.
+    per_host (int): Maximum number of open connections to a single host. Default is 2.
+    dns_ttl (int): Seconds a resolved address is reused. Default is 300.
+    keepalive (int): Seconds an idle connection is kept for reuse. Default is 30.
+    """
+
+    def __init__(self, limit=50, per_host=2, dns_ttl=300, keepalive=30):
+        self.limit = limit
+        self.per_host = per_host
+        self.dns_ttl = dns_ttl
+        self.keepalive = keepalive
+        # Built once: loading the CA store for every handshake is expensive
+        self.ssl_context = ssl.create_default_context()
+        self.stats = TransportStats()
+
+    def _trace_config(self):
+        stats = self.stats
+        trace = aiohttp.TraceConfig()
+
+        async def on_request_start(session, ctx, params):
+            stats.requests += 1
+            ctx.start = time.perf_counter()
+            ctx.connected = ctx.start
+
+        async def on_connection_create_start(session, ctx, params):
+            ctx.connect_start = time.perf_counter()
+
+        async def on_connection_create_end(session, ctx, params):
+            stats.new_connections += 1
+            ctx.connected = time.perf_counter()
+            # DNS resolution happens inside connection setup, count it separately
+            connect = ctx.connected - ctx.connect_start - getattr(ctx, 'dns', 0.0)
+            stats.connect_time += connect
+            _note(ctx, 'connect', connect)
+
+        async def on_connection_reuseconn(session, ctx, params):
+            stats.reused_connections += 1
+            ctx.connected = time.perf_counter()
+
+        async def on_dns_resolvehost_start(session, ctx, params):
+            ctx.dns_start = time.perf_counter()
+
+        async def on_dns_resolvehost_end(session, ctx, params):
+            stats.dns_lookups += 1
+            ctx.dns = time.perf_counter() - ctx.dns_start
+            stats.dns_time += ctx.dns
+            _note(ctx, 'dns', ctx.dns)
+
+        async def on_dns_cache_hit(session, ctx, params):
+            stats.dns_cache_hits += 1
+
+        async def on_request_end(session, ctx, params):
+            wait = time.perf_counter() - ctx.connected
+            stats.wait_time += wait
+            _note(ctx, 'wait', wait)
+
+        trace.on_request_start.append(on_request_start)
+        trace.on_connection_create_start.append(on_connection_create_start)
+        trace.on_connection_create_end.append(on_connection_create_end)
+        trace.on_connection_reuseconn.append(on_connection_reuseconn)
+        trace.on_dns_resolvehost_start.append(on_dns_resolvehost_start)
+        trace.on_dns_resolvehost_end.append(on_dns_resolvehost_end)
+        trace.on_dns_cache_hit.append(on_dns_cache_hit)
+        trace.on_request_end.append(on_request_end)
+        return trace
+
+    def session(self):
+        """
+        Open the client session of a crawl. Must be created inside the running event loop.
+        """
+        connector = aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.per_host,
+            use_dns_cache=True,
+            ttl_dns_cache=self.dns_ttl,
+            keepalive_timeout=self.keepalive,
+            ssl=self.ssl_context,
+        )
+        return aiohttp.ClientSession(headers=HEADERS, connector=connector,
+                                     trace_configs=[self._trace_config()])
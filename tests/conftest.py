@@ -0,0 +1,35 @@
+import functools
+import http.server
+import threading
+
+import pytest
+
+"""
+    Shared fixtures: a local HTTP server with a few small static pages.
+"""
+
+
+PAGES = 30
+
+
+class _QuietHandler(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def site(tmp_path):
+    """
+    Base URL of a server holding /0.html to /29.html, titled 'Page 0' to 'Page 29'.
+    """
+    pages = tmp_path / 'site'
+    pages.mkdir()
+    for i in range(PAGES):
+        (pages / f'{i}.html').write_text(f'<html lang="en"><title>Page {i}</title></html>')
+    handler = functools.partial(_QuietHandler, directory=str(pages))
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+    server.server_close()
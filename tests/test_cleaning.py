@@ -0,0 +1,25 @@
+import pandas as pd
+
+from scraper.cleaning import clean_file
+
+"""
+    Cleaning of scraped files, including ones written with a subset of the fields.
+"""
+
+
+def test_file_without_payment_gateways_column(tmp_path):
+    src = tmp_path / 'x.csv'
+    src.write_text('URL,Meta Title,Language\nhttps://a.com/,A,en\nhttps://b.com/,,N/A\n')
+    dst = tmp_path / 'clean.csv'
+    assert clean_file(str(src), str(dst)) == 2
+    cleaned = pd.read_csv(dst)
+    assert cleaned['Meta Title'].tolist() == ['A', 'Unknown']
+    assert cleaned['Language'].tolist() == ['en', 'Unknown']
+
+
+def test_payment_gateways_without_any_value_become_unknown(tmp_path):
+    src = tmp_path / 'x.csv'
+    src.write_text('URL,Payment Gateways\nhttps://a.com/,\nhttps://b.com/,N/A\n')
+    dst = tmp_path / 'clean.csv'
+    clean_file(str(src), str(dst))
+    assert pd.read_csv(dst)['Payment Gateways'].tolist() == ['Unknown', 'Unknown']
@@ -0,0 +1,17 @@
+import json
+
+from scraper import cli
+
+"""
+    The command line interface writing JSON lines to stdout.
+"""
+
+
+def test_stdout_holds_only_records_when_urls_fail(site, tmp_path, capsys):
+    url_file = tmp_path / 'urls.txt'
+    url_file.write_text(f'{site}/0.html\n{site}/missing.html\n{site}/1.html\n')
+    cli.main([str(url_file), '--fields', 'title,language', '--timeout', '5'])
+    out, err = capsys.readouterr()
+    records = [json.loads(line) for line in out.splitlines()]
+    assert sorted(record['Meta Title'] for record in records) == ['Page 0', 'Page 1']
+    assert 'HTTP 404' in err
@@ -0,0 +1,35 @@
+from scraper import DeadLetter, Frontier, ResponseCache, crawl
+from scraper.cli import unique_urls
+
+"""
+    Frontier crawls combined with the response cache.
+"""
+
+
+def test_pages_revalidated_with_304_are_done_not_failed(site, tmp_path):
+    urls = [f'{site}/{i}.html' for i in range(3)]
+    cache = ResponseCache(str(tmp_path / 'cache'), ttl=0)
+    dead_letter = DeadLetter(str(tmp_path / 'failed.jsonl'))
+    for run in range(2):
+        frontier = Frontier(str(tmp_path / 'frontier.sqlite3'))
+        frontier.clear()
+        frontier.add_many(urls)
+        results = crawl(frontier, fields=['Meta Title'], cache=cache, dead_letter=dead_letter)
+        assert sorted(result['Meta Title'] for result in results) == ['Page 0', 'Page 1', 'Page 2']
+        assert frontier.counts()['done'] == 3
+        frontier.close()
+    # Every page of the second run was stale and came back as 304 Not Modified
+    assert cache.stats['revalidated'] == 3
+    assert dead_letter.count == 0
+    cache.close()
+
+
+def test_bloom_filter_false_positives_do_not_drop_urls(tmp_path):
+    # A filter sized for 100 URLs answers 'probably seen' for many of 3000 distinct ones
+    urls = [f'https://site{i}.com/' for i in range(3000)]
+    frontier = Frontier(str(tmp_path / 'frontier.sqlite3'), capacity=100)
+    assert frontier.add_many(urls + urls[:10]) == 3000
+    assert frontier.duplicates == 10
+    frontier.close()
+
+    assert list(unique_urls(urls + urls[:10], capacity=100)) == urls
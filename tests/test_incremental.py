@@ -0,0 +1,29 @@
+from scraper import IncrementalState
+from scraper.extract import FIELDS
+
+"""
+    Incremental state kept across crawls of different field subsets.
+"""
+
+
+def test_partial_crawl_keeps_the_full_record(tmp_path):
+    path = str(tmp_path / 'state.sqlite3')
+    full = {'URL': 'https://a.com/', **{field: 'x' for field in FIELDS}}
+    with IncrementalState(path) as state:
+        state.update('https://a.com/', 'h1', full)
+    with IncrementalState(path) as state:
+        state.update('https://a.com/', 'h1', {'URL': 'https://a.com/', 'Meta Title': 'x'})
+    with IncrementalState(path) as state:
+        assert state.reuse('https://a.com/', 'h1') == full
+        state.failed('https://a.com/')
+        assert list(state.carried_over()) == [full]
+
+
+def test_partial_crawl_of_a_changed_page_drops_the_stale_record(tmp_path):
+    path = str(tmp_path / 'state.sqlite3')
+    with IncrementalState(path) as state:
+        state.update('https://a.com/', 'h1', {'URL': 'https://a.com/', **{field: 'x' for field in FIELDS}})
+        state.update('https://a.com/', 'h2', {'URL': 'https://a.com/', 'Meta Title': 'y'})
+        assert state.reuse('https://a.com/', 'h2') is None
+        state.failed('https://a.com/')
+        assert list(state.carried_over()) == []
@@ -0,0 +1,14 @@
+from scraper.metrics import Histogram, _prometheus_histogram
+
+"""
+    Prometheus export of the stage histograms.
+"""
+
+
+def test_bucket_bounds_and_sum_are_exported_exactly():
+    histogram = Histogram([1024, 1048576, 67108864])
+    histogram.observe(1234.56789)
+    lines = _prometheus_histogram('scraper_bytes', histogram)
+    assert 'scraper_bytes_bucket{le="1048576.0"} 1' in lines
+    assert 'scraper_bytes_bucket{le="67108864.0"} 1' in lines
+    assert 'scraper_bytes_sum 1234.56789' in lines
@@ -0,0 +1,60 @@
+import csv
+import os
+import subprocess
+import sys
+
+from scraper import cli
+
+from conftest import PAGES
+
+"""
+    Crash and resume of a --frontier crawl. The first run is killed with
+    os._exit part way through, after the queue has committed some URLs as
+    done but before the output's first checkpoint; the resumed run must
+    still leave every URL in the output exactly once.
+"""
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CRASH_AFTER = 8
+
+# Child process: the real command line, with a small queue batch so done URLs are committed
+# early, and a hard exit (no cleanup, no flush) once CRASH_AFTER results reached the output
+CRASHING_RUN = f'''
+import functools, os, sys
+from scraper import cli, sinks
+from scraper.frontier import Frontier
+
+cli.Frontier = functools.partial(Frontier, batch_size=5)
+write = sinks.CSVSink.write
+
+def crash_after(self, record):
+    write(self, record)
+    if self.written + len(self.rows) == {CRASH_AFTER}:
+        os._exit(3)
+
+sinks.CSVSink.write = crash_after
+cli.main(sys.argv[1:])
+'''
+
+
+def test_resume_after_crash_refetches_unsaved_urls(site, tmp_path):
+    urls = [f'{site}/{i}.html' for i in range(PAGES)]
+    url_file = tmp_path / 'urls.txt'
+    url_file.write_text('\n'.join(urls) + '\n')
+    output = tmp_path / 'out.csv'
+    frontier = tmp_path / 'crawl.sqlite3'
+    argv = [str(url_file), '-o', str(output), '--frontier', str(frontier), '--fields', 'title',
+            '--concurrency', '4', '--timeout', '5']
+
+    crashed = subprocess.run([sys.executable, '-c', CRASHING_RUN, *argv], cwd=ROOT,
+                             env={**os.environ, 'PYTHONPATH': ROOT}, capture_output=True, text=True)
+    assert crashed.returncode == 3, crashed.stderr
+
+    cli.main(argv)
+
+    with open(output, newline='', encoding='utf-8') as f:
+        rows = list(csv.DictReader(f))
+    saved = [row['URL'] for row in rows]
+    assert sorted(saved) == sorted(urls)
+    assert {row['Meta Title'] for row in rows} == {f'Page {i}' for i in range(PAGES)}
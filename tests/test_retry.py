@@ -0,0 +1,19 @@
+import ssl
+
+import aiohttp
+
+from scraper.retry import classify
+
+"""
+    Failure classification.
+"""
+
+
+def test_certificate_errors_are_permanent_without_os_error():
+    # aiohttp 3.9 builds ClientConnectorCertificateError without setting its os_error
+    error = aiohttp.ClientConnectorCertificateError.__new__(aiohttp.ClientConnectorCertificateError)
+    error._certificate_error = ssl.SSLCertVerificationError(1, 'certificate has expired')
+    assert not hasattr(error, '_os_error')
+    transient, reason = classify(error)
+    assert not transient
+    assert 'certificate has expired' in reason
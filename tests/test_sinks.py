@@ -0,0 +1,36 @@
+import pandas as pd
+import pytest
+
+from scraper import open_sink
+
+"""
+    CSV and Parquet outputs written through one SinkGroup. A crash between
+    the two sinks' writes must not leave them holding different URLs after
+    the crawl resumes.
+"""
+
+
+def test_group_resume_rolls_every_sink_back_to_the_shared_checkpoint(tmp_path):
+    paths = [str(tmp_path / 'out.csv'), str(tmp_path / 'out.parquet')]
+    group = open_sink(paths, fields=['Meta Title'], batch_size=3)
+    for i in range(7):
+        group.write({'URL': f'https://site{i}.com/', 'Meta Title': f'Site {i}'})
+    # Crash after the CSV wrote the next batch but before the Parquet sink and the checkpoint did
+    group.sinks[0]._write_batch([{'URL': 'https://lost.com/', 'Meta Title': 'Lost'}])
+
+    resumed = open_sink(paths, fields=['Meta Title'], batch_size=3, resume=True)
+    saved = [f'https://site{i}.com/' for i in range(6)]
+    assert list(resumed.completed_urls()) == saved
+    assert list(resumed.sinks[1].completed_urls()) == saved
+
+    resumed.write({'URL': 'https://site9.com/', 'Meta Title': 'Site 9'})
+    resumed.close()
+    titles = [f'Site {i}' for i in range(6)] + ['Site 9']
+    for table in (pd.read_csv(paths[0]), pd.read_parquet(paths[1])):
+        assert table['URL'].tolist() == saved + ['https://site9.com/']
+        assert table['Meta Title'].tolist() == titles
+
+
+def test_unknown_fields_are_rejected(tmp_path):
+    with pytest.raises(ValueError, match='title'):
+        open_sink(str(tmp_path / 'out.csv'), fields=['title'])